@@ -4,9 +4,20 @@
 # Created on: March  6, 2024
 # Author: Lucas Araújo <araujolucas@dcc.ufmg.br>
 
+import os
 import sys
+import glob
+import argparse
 from datetime import datetime, timedelta
+
+from pomo.config import DB_FILE, EXPORT_BATCH_SIZE, IMPORT_BATCH_SIZE
+from pomo.db_manager import DBManager
+
 from .analytics import Analytics
+from .export import Exporter
+from .importer import Importer
+
+COMMANDS = ("report", "rebuild", "export", "import")
 
 
 def get_date_range(current_date, days_before):
@@ -19,30 +30,210 @@ def get_date_range(current_date, days_before):
     return start_date.strftime("%Y-%m-%d"), end_date.strftime("%Y-%m-%d")
 
 
-def main():
-    if len(sys.argv) != 2 and len(sys.argv) != 3:
-        print("Usage: python3 -m analytics <start_date> <end_date>")
-        print(
-            "Usage: python3 -m analytics <n days before> # to get the range from n days before to today"
-        )
-        print("Date format: YYYY-MM-DD")
+def parse_args(argv):
+    """
+    Parse the command line arguments
+    """
+    parser = argparse.ArgumentParser(
+        description="Analyse the sessions recorded by pomo",
+        epilog="Running without a command is the same as running 'report'",
+    )
+
+    # Options shared by every command
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument(
+        "-db",
+        "--database",
+        type=str,
+        action="append",
+        default=None,
+        help="Path to database, may be repeated to merge many databases",
+    )
+    common.add_argument(
+        "--db-dir",
+        type=str,
+        default=None,
+        help="use every *.db file of this directory, such as the ones of a team",
+    )
+
+    sub = parser.add_subparsers(dest="command")
+
+    report = sub.add_parser(
+        "report",
+        parents=[common],
+        help="report the performance between two dates",
+        description="<start_date> <end_date> gives the range of the report. "
+        "<n days before> alone gives the range from n days before to today. "
+        "Date format: YYYY-MM-DD",
+    )
+    report.add_argument("range", nargs="+", metavar="<start_date> <end_date>")
+    report.add_argument(
+        "-f",
+        "--format",
+        choices=("chart", "text", "json"),
+        default="chart",
+        help="chart (default) draws the charts, text and json print a summary",
+    )
+    report.add_argument(
+        "-o",
+        "--output-dir",
+        type=str,
+        default=None,
+        help="save the charts to this directory instead of showing them",
+    )
+    report.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="read every day from the database instead of the cache",
+    )
+    report.add_argument(
+        "--image-format",
+        choices=("png", "svg"),
+        default="png",
+        help="format of the saved charts",
+    )
+
+    sub.add_parser(
+        "rebuild",
+        parents=[common],
+        help="recompute the per day and tag totals from the sessions",
+    )
+
+    export = sub.add_parser(
+        "export",
+        parents=[common],
+        help="export the session history to CSV, JSONL or Parquet",
+    )
+    export.add_argument("output", help="output file, or - for the standard output")
+    export.add_argument(
+        "-f",
+        "--format",
+        choices=Exporter.FORMATS,
+        default=None,
+        help="output format, guessed from the file extension by default",
+    )
+    export.add_argument("--start", type=str, default=None, help="first date (YYYY-MM-DD)")
+    export.add_argument("--end", type=str, default=None, help="last date (YYYY-MM-DD)")
+    export.add_argument(
+        "--batch-size",
+        type=int,
+        default=EXPORT_BATCH_SIZE,
+        help="sessions read from the database at a time",
+    )
+
+    importer = sub.add_parser(
+        "import",
+        parents=[common],
+        help="import sessions from CSV or JSONL, skipping the ones already recorded",
+    )
+    importer.add_argument("input", help="input file, or - for the standard input")
+    importer.add_argument(
+        "-f",
+        "--format",
+        choices=Importer.FORMATS,
+        default=None,
+        help="input format, guessed from the file extension by default",
+    )
+    importer.add_argument(
+        "--batch-size",
+        type=int,
+        default=IMPORT_BATCH_SIZE,
+        help="sessions written to the database per transaction",
+    )
+
+    # Keep 'python3 -m analytics <range>' working
+    if argv and argv[0] not in COMMANDS and argv[0] not in ("-h", "--help"):
+        argv = ["report"] + argv
+
+    args = parser.parse_args(argv)
+
+    if args.command is None:
+        parser.print_help()
         sys.exit(1)
 
-    if len(sys.argv) == 2:
-        days_before = int(sys.argv[1])
+    args.databases = list(args.database or [])
+
+    if args.db_dir:
+        args.databases += sorted(glob.glob(os.path.join(args.db_dir, "*.db")))
+
+        if not args.databases:
+            parser.error(f"no databases found in {args.db_dir}")
+
+    if not args.databases:
+        args.databases = [DB_FILE]
 
-        assert days_before > 0, "Days before must be greater than 0"
+    if args.command in ("export", "import") and len(args.databases) > 1:
+        parser.error(f"{args.command} works on a single database")
 
-        current_date = datetime.now()
-        start_date, end_date = get_date_range(current_date, days_before)
+    if args.command == "report":
+        if len(args.range) == 1:
+            days_before = int(args.range[0])
 
-    elif len(sys.argv) == 3:
-        start_date = sys.argv[1]
-        end_date = sys.argv[2]
+            assert days_before > 0, "Days before must be greater than 0"
 
-    analytics = Analytics()
+            current_date = datetime.now()
+            args.start_date, args.end_date = get_date_range(current_date, days_before)
 
-    analytics.performance_between_dates(start_date, end_date)
+        elif len(args.range) == 2:
+            args.start_date, args.end_date = args.range
+
+        else:
+            report.error("expected <start_date> <end_date> or <n days before>")
+
+    return args
+
+
+def main():
+    args = parse_args(sys.argv[1:])
+
+    analytics = Analytics(args.databases, cache=not getattr(args, "no_cache", False))
+
+    if args.command == "rebuild":
+        for database in args.databases:
+            DBManager(database).rebuild_rollup()
+            print(f"Rebuilt the per day and tag totals of {database}")
+
+    elif args.command == "export":
+        exporter = Exporter(analytics.db_manager, args.batch_size)
+
+        try:
+            total = exporter.export(args.output, args.format, args.start, args.end)
+
+        except (ValueError, RuntimeError) as e:
+            sys.stderr.write(f"{e}\n")
+            sys.exit(1)
+
+        sys.stderr.write(f"Exported {total} sessions\n")
+
+    elif args.command == "import":
+        def progress(result):
+            sys.stderr.write(
+                f"{result.read} read, {result.inserted} inserted "
+                f"({result.rate:.0f} sessions/s)\n"
+            )
+
+        importer = Importer(analytics.db_manager, args.batch_size, progress)
+
+        try:
+            result = importer.import_file(args.input, args.format)
+
+        except (OSError, ValueError) as e:
+            sys.stderr.write(f"{e}\n")
+            sys.exit(1)
+
+        sys.stderr.write(
+            f"Imported {result.inserted} sessions, skipped {result.skipped} "
+            f"duplicates in {result.elapsed:.2f}s ({result.rate:.0f} sessions/s)\n"
+        )
+
+    else:
+        analytics.performance_between_dates(
+            args.start_date,
+            args.end_date,
+            output_format=args.format,
+            output_dir=args.output_dir,
+            image_format=args.image_format,
+        )
 
 
 if __name__ == "__main__":
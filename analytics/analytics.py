@@ -4,22 +4,90 @@
 # Created on: March  6, 2024
 # Author: Lucas Araújo <araujolucas@dcc.ufmg.br>
 
-
-import matplotlib.pyplot as plt
-import pandas as pd
+import os
+import json
 
 from datetime import datetime
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor
 
 
-from pomo.config import DB_FILE, DB_TABLE_NAME, HOUR_FACTOR, MINUTE_FACTOR
+from pomo.config import ANALYTICS_WORKERS, DB_FILE, HOUR_FACTOR, MINUTE_FACTOR
 from pomo.db_manager import DBManager
 
+from .cache import AnalyticsCache
+from .summary import FocusSummary, PerformanceSummary, WEEKDAYS
+
+
+def summarize(db_manager, start, end, cache=True):
+    """
+    Get the summary of one database between start and end dates, reading
+    the per day and tag totals through the cache unless disabled
+    """
+    summary = PerformanceSummary(start, end)
+
+    if cache:
+        rows = AnalyticsCache(db_manager.database).rows(
+            "rollup",
+            start,
+            end,
+            db_manager.today(),
+            db_manager.get_versions(),
+            db_manager.iter_rollup,
+        )
+
+    else:
+        rows = db_manager.iter_rollup(start, end)
+
+    for date, tag, seconds, count in rows:
+        summary.add(date, tag, seconds, count)
+
+    return summary
+
+
+def summarize_focus(db_manager, start, end):
+    """
+    Get the focus statistics of one database between start and end dates,
+    from the running spans of its sessions. Not cached: the spans of the
+    open session are written without bumping the data version
+    """
+    focus = FocusSummary(start, end)
+
+    for session_id, span_start, seconds, _ in db_manager.iter_intervals(start, end):
+        focus.add(session_id, span_start, seconds)
+
+    return focus
+
+
+def summarize_database(database, start, end, function=summarize):
+    """
+    Get the summary of one database file with function. Runs in the worker
+    processes of Analytics. The database may belong to someone else, so it
+    is only read
+    """
+    db_manager = DBManager(database, read_only=True)
+
+    try:
+        return function(db_manager, start, end)
+
+    finally:
+        db_manager.close()
+
 
 class Analytics:
-    """ """
+    """
+    Reports of the sessions of one database, or of many databases merged
+    together, such as the ones of a whole team
+    """
+
+    def __init__(self, database=DB_FILE, workers=ANALYTICS_WORKERS, cache=True):
+        if isinstance(database, str):
+            database = [database]
 
-    def __init__(self):
-        self.db_manager = DBManager(DB_FILE)
+        self.databases = list(database)
+        self.workers = workers
+        self.cache = cache
+        self.db_manager = DBManager(self.databases[0])
 
     def __del__(self):
         pass
@@ -71,90 +139,166 @@ class Analytics:
         """
         Query the total sum of duration between start and end dates
         """
-        query = f"""SELECT SUM(duration)
-                    FROM '{DB_TABLE_NAME}'
-                    WHERE date BETWEEN '{start}' AND '{end}'"""
-
-        return self.db_manager.perform_query(query)
+        return self.db_manager.query_range(start, end)
 
     def query_sum_per_day(self, start, end):
         """
         Query the sum of duration per day between start and end dates
         """
-        query = f"""SELECT date, SUM(duration) as total_duration
-                    FROM '{DB_TABLE_NAME}'
-                    WHERE date BETWEEN '{start}' AND '{end}'
-                    GROUP BY date"""
-
-        return self.db_manager.perform_query(query)
+        return self.db_manager.query_range(start, end, group_by="date")
 
     def query_sum_per_tag(self, start, end):
         """
         Query the sum of duration per tag between start and end dates
         """
-        query = f"""SELECT tag, SUM(duration) as total_duration
-                    FROM '{DB_TABLE_NAME}'
-                    WHERE date BETWEEN '{start}' AND '{end}'
-                    GROUP BY tag"""
+        return self.db_manager.query_range(start, end, group_by="tag")
+
+    def summary(self, start, end):
+        """
+        Query the total, per day, per tag and per day and tag durations
+        between start and end dates in a single scan of each database.
+        Many databases are scanned in a process pool and merged. Results of
+        past days come from the cache while the databases do not change
+
+        Returns:
+            PerformanceSummary: The aggregated durations
+        """
+        if len(self.databases) > 1:
+            return self.merged(
+                partial(summarize, cache=self.cache), PerformanceSummary(start, end)
+            )
+
+        return summarize(self.db_manager, start, end, self.cache)
+
+    def focus(self, start, end):
+        """
+        Query the focus time, pauses and focus time per weekday and hour
+        between start and end dates
+
+        Returns:
+            FocusSummary: The focus statistics
+        """
+        if len(self.databases) > 1:
+            return self.merged(summarize_focus, FocusSummary(start, end))
+
+        return summarize_focus(self.db_manager, start, end)
+
+    def merged(self, function, summary):
+        """
+        Summarize every database with function in a worker process and
+        merge the results into summary. With a single worker the databases
+        are scanned in this process
+        """
+        start, end = summary.start, summary.end
+        count = len(self.databases)
+        workers = min(self.workers or os.cpu_count() or 1, count)
+
+        if workers == 1:
+            for database in self.databases:
+                summary.merge(summarize_database(database, start, end, function))
+
+            return summary
+
+        with ProcessPoolExecutor(workers) as executor:
+            for result in executor.map(
+                summarize_database,
+                self.databases,
+                [start] * count,
+                [end] * count,
+                [function] * count,
+                chunksize=max(1, count // (4 * workers)),
+            ):
+                summary.merge(result)
+
+        return summary
+
+    def format_duration(self, seconds):
+        """
+        Format seconds as 'H h M min'
+        """
+        hours, minutes = self.seconds_to_hours_minutes(seconds)
+        return f"{hours} h {minutes} min"
+
+    def text_report(self, summary, focus=None):
+        """
+        Format a summary, and the focus statistics if given, as a plain
+        text report
+        """
+        lines = [
+            f"Performance between {summary.start} and {summary.end}",
+            f"Total: {self.format_duration(summary.total)} in {summary.sessions} sessions",
+        ]
+
+        for title, rows in (("Per day", summary.days()), ("Per tag", summary.tags())):
+            lines.append("")
+            lines.append(title)
 
-        return self.db_manager.perform_query(query)
+            if not rows:
+                lines.append("  no sessions")
 
-    def performance_between_dates(self, start, end):
+            width = max((len(key) for key, _ in rows), default=0)
+
+            for key, seconds in rows:
+                lines.append(f"  {key:<{width}}  {self.format_duration(seconds):>14}")
+
+        if focus is not None and focus.spans:
+            busiest = focus.busiest_hour()
+            weekday, _ = max(
+                zip(WEEKDAYS, focus.heatmap), key=lambda item: sum(item[1])
+            )
+            lines += [
+                "",
+                "Focus",
+                f"  Focus time    {self.format_duration(focus.focus)}",
+                f"  Spans         {focus.spans} in {focus.sessions} sessions, "
+                f"{focus.pauses} pauses",
+                f"  Average span  {self.format_duration(focus.average())}",
+                f"  Longest span  {self.format_duration(focus.longest)}",
+                f"  Busiest hour  {busiest:02d}:00, busiest weekday {weekday}",
+            ]
+
+        return "\n".join(lines)
+
+    def performance_between_dates(
+        self, start, end, output_format="chart", output_dir=None, image_format="png"
+    ):
         """
         Prints the performance metrics between start and end dates
+
+        output_format is "text" or "json" for headless reports, or "chart"
+        to draw the charts, which are shown in a window unless output_dir is
+        given to save them as image_format files
         """
 
         assert self.is_valid_date_format(start), f"Invalid date format {start}"
         assert self.is_valid_date_format(end), f"Invalid date format {end}"
         assert self.is_valid_date_range(start, end), "Invalid date range"
 
-        print(f"Performance between {start} and {end}")
+        summary = self.summary(start, end)
+        focus = self.focus(start, end)
 
-        # Query and print total sum
-        total_sum = self.query_total_sum(start, end)
+        if output_format == "json":
+            data = summary.to_dict()
+            data["focus"] = focus.to_dict()
+            print(json.dumps(data, indent=2))
+            return
 
-        # Query and print sum per day
-        sum_per_day = self.query_sum_per_day(start, end)
+        if output_format == "text":
+            print(self.text_report(summary, focus))
+            return
 
-        df = pd.DataFrame(sum_per_day, columns=["date", "total_duration"])
-        df["date"] = pd.to_datetime(df["date"])
-        df["total_duration_hours"] = df["total_duration"] / HOUR_FACTOR
+        print(f"Performance between {start} and {end}")
 
-        # total_sum_hours = total_sum[0][0] / HOUR_FACTOR if total_sum[0][0] else 0
+        # Only import matplotlib when charts are requested
+        from .charts import Charts
 
-        get_hours, get_minutes = self.seconds_to_hours_minutes(total_sum[0][0])
+        charts = Charts(output_dir, image_format)
+        get_hours, get_minutes = self.seconds_to_hours_minutes(summary.total)
 
-        plt.figure(figsize=(10, 6))
-        plt.bar(
-            df["date"].dt.strftime("%Y-%m-%d"),
-            df["total_duration_hours"],
-            color="darkblue",
-            label="Per Day",
-        )
-        # Mostre a hora no formato HH:MM
-        plt.title(
-            "Sum of duration per day with total. The total sum is {} h {} min".format(
-                get_hours, get_minutes
-            )
-        )
-        plt.xlabel("Date")
-        plt.ylabel("Total duration (hours)")
-        plt.xticks(rotation=45)
-        plt.legend()
-        plt.tight_layout()
-        plt.show()
-
-        # Query and print sum per tag
-        sum_per_tag = self.query_sum_per_tag(start, end)
-
-        df = pd.DataFrame(sum_per_tag, columns=["tag", "total_duration"])
-        df["total_duration_hours"] = df["total_duration"] / HOUR_FACTOR
-
-        plt.figure(figsize=(10, 6))
-        plt.bar(df["tag"], df["total_duration_hours"], color="darkblue")
-        plt.title(f"Sum of duration per tag considering the period {start} to {end}")
-        plt.xlabel("Tag")
-        plt.ylabel("Total duration (hours)")
-        plt.xticks(rotation=45)
-        plt.tight_layout()
-        plt.show()
+        for path in (
+            charts.per_day(summary, get_hours, get_minutes),
+            charts.per_tag(summary),
+            charts.heatmap(focus) if focus.spans else None,
+        ):
+            if path is not None:
+                print(f"Saved {path}")
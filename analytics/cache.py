@@ -0,0 +1,146 @@
+#!/usr/bin/env python
+
+# Filename: cache.py
+# Created on: October 18, 2026
+# Author: Lucas Araújo <araujolucas@dcc.ufmg.br>
+
+import os
+import json
+import hashlib
+import tempfile
+from datetime import datetime, timedelta
+
+from pomo.config import ANALYTICS_CACHE_DIR, ANALYTICS_CACHE_ENTRIES
+
+
+class AnalyticsCache:
+    """
+    Cache of query results of one database, keyed by query kind and date
+    range, kept in a JSON file between runs
+
+    Days before the last day written to the database are treated as
+    immutable: their results are kept until the history_version of the
+    database changes, which only happens when a past day is written
+    (imports, rebuilds, a session finished after midnight). The results of
+    the last day written on, and of today, are kept until the data_version
+    changes, which happens on every session finished or retagged on the
+    current day. Going by the last day written, and not by the clock of the
+    reader, keeps a day of a copy taken mid-day from being cached as final.
+    Everything is dropped when a different database (by its database_id)
+    is found at the same path
+    """
+
+    def __init__(self, database, cache_dir=ANALYTICS_CACHE_DIR):
+        digest = hashlib.sha1(os.path.abspath(database).encode()).hexdigest()[:16]
+        self.path = os.path.join(cache_dir, f"analytics-{digest}.json")
+        self.database_id = None
+        self.history_version = None
+        self.entries = {}
+        self.changed = False
+        self.load()
+
+    def load(self):
+        """
+        Load the cache file, starting empty if it is missing or unreadable
+        """
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+
+            self.database_id = data["database_id"]
+            self.history_version = data["history_version"]
+            self.entries = data["entries"]
+
+        except (OSError, ValueError, KeyError, TypeError):
+            self.database_id = None
+            self.history_version = None
+            self.entries = {}
+
+    def save(self):
+        """
+        Write the cache file if it changed, replacing it atomically so that
+        concurrent readers never see a partial file
+        """
+        if not self.changed:
+            return
+
+        # Keep the most recently inserted entries
+        while len(self.entries) > ANALYTICS_CACHE_ENTRIES:
+            del self.entries[next(iter(self.entries))]
+
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(self.path))
+
+            with os.fdopen(fd, "w") as f:
+                json.dump(
+                    {
+                        "database_id": self.database_id,
+                        "history_version": self.history_version,
+                        "entries": self.entries,
+                    },
+                    f,
+                )
+
+            os.replace(tmp, self.path)
+
+        except OSError:
+            # The cache is an optimization, failing to write it is harmless
+            return
+
+        self.changed = False
+
+    def lookup(self, kind, start, end, version, load):
+        """
+        Get the cached result of load(start, end), calling it on a miss.
+        version is the counter the entry must match
+        """
+        key = f"{kind}:{start}:{end}"
+        entry = self.entries.get(key)
+
+        if entry is not None and entry["version"] == version:
+            return entry["rows"]
+
+        rows = [list(row) for row in load(start, end)]
+        self.entries.pop(key, None)
+        self.entries[key] = {"version": version, "rows": rows}
+        self.changed = True
+
+        return rows
+
+    def rows(self, kind, start, end, today, versions, load):
+        """
+        Get the rows of load between start and end dates (YYYY-MM-DD),
+        splitting the range into the immutable past days, cached until the
+        history changes, and the days from the last one written on, cached
+        until the data changes
+
+        Args:
+            versions: (database_id, history_version, data_version, last_day)
+                      of the database, as given by DBManager.get_versions
+            load: Function of (start, end) returning the rows of a range
+        """
+        database_id, history_version, data_version, last_day = versions
+
+        if (database_id, history_version) != (self.database_id, self.history_version):
+            self.database_id = database_id
+            self.history_version = history_version
+            self.entries = {}
+            self.changed = True
+
+        # The first day that may still change
+        current = min(today, last_day) if last_day else today
+        previous = (datetime.strptime(current, "%Y-%m-%d") - timedelta(days=1)).strftime(
+            "%Y-%m-%d"
+        )
+        rows = []
+
+        if start <= min(end, previous):
+            rows += self.lookup(kind, start, min(end, previous), None, load)
+
+        if end >= current:
+            rows += self.lookup(kind, max(start, current), end, data_version, load)
+
+        self.save()
+
+        return rows
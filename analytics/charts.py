@@ -0,0 +1,131 @@
+#!/usr/bin/env python
+
+# Filename: charts.py
+# Created on: October 18, 2026
+# Author: Lucas Araújo <araujolucas@dcc.ufmg.br>
+
+import os
+
+from pomo.config import HOUR_FACTOR
+
+from .summary import WEEKDAYS
+
+
+class Charts:
+    """
+    Draw the charts of a PerformanceSummary
+
+    matplotlib is only imported when a chart is drawn. Charts are shown in a
+    window, or saved to files with a non-interactive backend when an output
+    directory is given, which needs no display (e.g. in cron jobs)
+    """
+
+    def __init__(self, output_dir=None, image_format="png"):
+        self.output_dir = output_dir
+        self.image_format = image_format
+        self.plt = self.load_pyplot()
+
+    def load_pyplot(self):
+        """
+        Import pyplot, selecting the non-interactive backend first when
+        saving to files
+        """
+        import matplotlib
+
+        if self.output_dir is not None:
+            matplotlib.use("Agg")
+
+        import matplotlib.pyplot as plt
+
+        return plt
+
+    def finish(self, name):
+        """
+        Show the current figure or save it to the output directory
+
+        Returns:
+            str: The path of the saved file, or None if shown
+        """
+        plt = self.plt
+        plt.tight_layout()
+
+        if self.output_dir is None:
+            plt.show()
+            return None
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        path = os.path.join(self.output_dir, f"{name}.{self.image_format}")
+        plt.savefig(path)
+        plt.close()
+
+        return path
+
+    def per_day(self, summary, hours, minutes):
+        """
+        Draw the sum of duration per day
+        """
+        plt = self.plt
+        days = summary.days()
+
+        plt.figure(figsize=(10, 6))
+        plt.bar(
+            [date for date, _ in days],
+            [seconds / HOUR_FACTOR for _, seconds in days],
+            color="darkblue",
+            label="Per Day",
+        )
+        # Mostre a hora no formato HH:MM
+        plt.title(
+            "Sum of duration per day with total. The total sum is {} h {} min".format(
+                hours, minutes
+            )
+        )
+        plt.xlabel("Date")
+        plt.ylabel("Total duration (hours)")
+        plt.xticks(rotation=45)
+        plt.legend()
+
+        return self.finish(f"per_day_{summary.start}_{summary.end}")
+
+    def per_tag(self, summary):
+        """
+        Draw the sum of duration per tag
+        """
+        plt = self.plt
+        tags = summary.tags()
+
+        plt.figure(figsize=(10, 6))
+        plt.bar(
+            [tag for tag, _ in tags],
+            [seconds / HOUR_FACTOR for _, seconds in tags],
+            color="darkblue",
+        )
+        plt.title(
+            f"Sum of duration per tag considering the period {summary.start} to {summary.end}"
+        )
+        plt.xlabel("Tag")
+        plt.ylabel("Total duration (hours)")
+        plt.xticks(rotation=45)
+
+        return self.finish(f"per_tag_{summary.start}_{summary.end}")
+
+    def heatmap(self, focus):
+        """
+        Draw the focus time per weekday and hour of the day
+        """
+        plt = self.plt
+
+        plt.figure(figsize=(12, 4))
+        plt.imshow(
+            [[seconds / HOUR_FACTOR for seconds in row] for row in focus.heatmap],
+            aspect="auto",
+            cmap="Blues",
+        )
+        plt.colorbar(label="Focus time (hours)")
+        plt.title(f"Focus time per hour considering the period {focus.start} to {focus.end}")
+        plt.xlabel("Hour of the day")
+        plt.ylabel("Weekday")
+        plt.xticks(range(24))
+        plt.yticks(range(7), WEEKDAYS)
+
+        return self.finish(f"focus_{focus.start}_{focus.end}")
@@ -0,0 +1,128 @@
+#!/usr/bin/env python
+
+# Filename: export.py
+# Created on: October 18, 2026
+# Author: Lucas Araújo <araujolucas@dcc.ufmg.br>
+
+import csv
+import sys
+import json
+
+from pomo.config import EXPORT_BATCH_SIZE
+from pomo.db_statements import SQL
+
+
+class Exporter:
+    """
+    Export the session history to CSV, JSONL or Parquet files
+
+    Rows are streamed from the database in fixed-size batches and written
+    as they arrive, so memory use does not depend on the size of the history
+    """
+
+    FORMATS = ("csv", "jsonl", "parquet")
+
+    def __init__(self, db_manager, batch_size=EXPORT_BATCH_SIZE):
+        self.db_manager = db_manager
+        self.batch_size = batch_size
+
+    def guess_format(self, output):
+        """
+        Guess the format from the extension of the output file, defaulting
+        to CSV for the standard output
+        """
+        if output == "-":
+            return "csv"
+
+        extension = output.rsplit(".", 1)[-1].lower()
+
+        if extension in ("json", "ndjson"):
+            return "jsonl"
+
+        return extension if extension in self.FORMATS else None
+
+    def export(self, output, output_format=None, start=None, end=None):
+        """
+        Export the sessions between start and end dates, or all of them, to
+        the output file ('-' for the standard output)
+
+        Returns:
+            int: The number of exported sessions
+        """
+        output_format = output_format or self.guess_format(output)
+
+        if output_format not in self.FORMATS:
+            raise ValueError(f"Unknown export format for {output}, use one of {self.FORMATS}")
+
+        batches = self.db_manager.iter_sessions(start, end, self.batch_size)
+
+        if output_format == "parquet":
+            return self.write_parquet(batches, output)
+
+        write = self.write_csv if output_format == "csv" else self.write_jsonl
+
+        if output == "-":
+            return write(batches, sys.stdout)
+
+        with open(output, "w", newline="") as f:
+            return write(batches, f)
+
+    def write_csv(self, batches, f):
+        """
+        Write the batches as CSV with a header line
+        """
+        writer = csv.writer(f)
+        writer.writerow(SQL.SESSION_COLUMNS)
+        total = 0
+
+        for rows in batches:
+            writer.writerows(rows)
+            total += len(rows)
+
+        return total
+
+    def write_jsonl(self, batches, f):
+        """
+        Write the batches as one JSON object per line
+        """
+        total = 0
+
+        for rows in batches:
+            f.writelines(
+                json.dumps(dict(zip(SQL.SESSION_COLUMNS, row))) + "\n" for row in rows
+            )
+            total += len(rows)
+
+        return total
+
+    def write_parquet(self, batches, path):
+        """
+        Write the batches as a Parquet file, one row group per batch.
+        Requires the optional pyarrow package
+        """
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+        except ImportError:
+            raise RuntimeError("Exporting to Parquet requires the pyarrow package")
+
+        schema = pa.schema(
+            [
+                ("id", pa.int64()),
+                ("date", pa.string()),
+                ("start", pa.string()),
+                ("start_ts", pa.int64()),
+                ("duration", pa.int64()),
+                ("tag", pa.string()),
+            ]
+        )
+        total = 0
+
+        with pq.ParquetWriter(path, schema) as writer:
+            for rows in batches:
+                columns = [list(column) for column in zip(*rows)]
+                writer.write_table(pa.Table.from_arrays(columns, schema=schema))
+                total += len(rows)
+
+        return total
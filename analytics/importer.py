@@ -0,0 +1,169 @@
+#!/usr/bin/env python
+
+# Filename: importer.py
+# Created on: October 18, 2026
+# Author: Lucas Araújo <araujolucas@dcc.ufmg.br>
+
+import csv
+import sys
+import json
+import time
+from datetime import datetime
+from dataclasses import dataclass
+
+from pomo.config import IMPORT_BATCH_SIZE
+
+
+@dataclass
+class ImportResult:
+    """
+    Counters of an import
+    """
+
+    read: int = 0
+    inserted: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def skipped(self):
+        return self.read - self.inserted
+
+    @property
+    def rate(self):
+        return self.read / self.elapsed if self.elapsed > 0 else 0.0
+
+
+class Importer:
+    """
+    Import sessions from CSV or JSONL files, such as the ones written by
+    the exporter
+
+    Each row needs a start, given as start_ts or as date and start, and may
+    have a duration and a tag. Rows are written in large transactions with
+    executemany, and sessions whose start and tag are already in the database
+    are skipped, so importing the same file twice is harmless
+    """
+
+    FORMATS = ("csv", "jsonl")
+
+    def __init__(self, db_manager, batch_size=IMPORT_BATCH_SIZE, progress=None):
+        self.db_manager = db_manager
+        self.batch_size = batch_size
+        self.progress = progress
+
+    def guess_format(self, source):
+        """
+        Guess the format from the extension of the input file, defaulting
+        to CSV for the standard input
+        """
+        if source == "-":
+            return "csv"
+
+        extension = source.rsplit(".", 1)[-1].lower()
+
+        if extension in ("json", "ndjson"):
+            return "jsonl"
+
+        return extension if extension in self.FORMATS else None
+
+    def to_row(self, record):
+        """
+        Convert a record to a (date, start, start_ts, duration, tag) row,
+        deriving the missing start columns
+        """
+        start_ts = record.get("start_ts")
+        duration = record.get("duration")
+        tag = record.get("tag")
+
+        if start_ts not in (None, ""):
+            start_ts = int(start_ts)
+            local = self.db_manager.local_datetime(start_ts)
+
+        else:
+            local = datetime.strptime(
+                f"{record['date']} {record['start']}", "%Y-%m-%d %H:%M:%S"
+            )
+            start_ts = self.db_manager.local_timestamp(local)
+
+        return (
+            local.strftime("%Y-%m-%d"),
+            local.strftime("%H:%M:%S"),
+            start_ts,
+            int(duration) if duration not in (None, "") else None,
+            tag if tag != "" else None,
+        )
+
+    def read_csv(self, f):
+        """
+        Read the records of a CSV file with a header line
+        """
+        yield from csv.DictReader(f)
+
+    def read_jsonl(self, f):
+        """
+        Read the records of a file with one JSON object per line
+        """
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+    def batches(self, records):
+        """
+        Group the rows of the records in lists of batch_size
+        """
+        batch = []
+
+        for number, record in enumerate(records, start=1):
+            try:
+                batch.append(self.to_row(record))
+
+            except (KeyError, ValueError, TypeError) as e:
+                raise ValueError(f"Invalid session in record {number}: {e!r}")
+
+            if len(batch) >= self.batch_size:
+                yield batch
+                batch = []
+
+        if batch:
+            yield batch
+
+    def import_file(self, source, input_format=None):
+        """
+        Import the sessions of the source file ('-' for the standard input).
+        Every batch is committed on its own, so an invalid record stops the
+        import but keeps the batches written before it
+
+        Returns:
+            ImportResult: The number of read and inserted sessions
+        """
+        input_format = input_format or self.guess_format(source)
+
+        if input_format not in self.FORMATS:
+            raise ValueError(f"Unknown import format for {source}, use one of {self.FORMATS}")
+
+        read = self.read_csv if input_format == "csv" else self.read_jsonl
+
+        if source == "-":
+            return self.write(read(sys.stdin))
+
+        with open(source, newline="") as f:
+            return self.write(read(f))
+
+    def write(self, records):
+        """
+        Write the records to the database in batches
+        """
+        result = ImportResult()
+        start = time.perf_counter()
+
+        for batch in self.batches(records):
+            result.inserted += self.db_manager.import_sessions(batch)
+            result.read += len(batch)
+            result.elapsed = time.perf_counter() - start
+
+            if self.progress:
+                self.progress(result)
+
+        result.elapsed = time.perf_counter() - start
+
+        return result
@@ -0,0 +1,187 @@
+#!/usr/bin/env python
+
+# Filename: summary.py
+# Created on: October 18, 2026
+# Author: Lucas Araújo <araujolucas@dcc.ufmg.br>
+
+from dataclasses import dataclass, field
+
+from pomo.config import DAY_FACTOR, GMT_OFFSET, HOUR_FACTOR
+
+WEEKDAYS = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+
+
+@dataclass
+class PerformanceSummary:
+    """
+    Aggregated durations, in seconds, of the sessions between two dates
+    (inclusive, YYYY-MM-DD), built in a single pass over the per day and
+    tag totals
+    """
+
+    start: str
+    end: str
+    total: int = 0
+    sessions: int = 0
+    per_day: dict = field(default_factory=dict)
+    per_tag: dict = field(default_factory=dict)
+    # (date, tag) -> seconds
+    per_day_tag: dict = field(default_factory=dict)
+
+    def add(self, date, tag, seconds, count):
+        """
+        Add the total of one day and tag
+        """
+        self.total += seconds
+        self.sessions += count
+        self.per_day[date] = self.per_day.get(date, 0) + seconds
+        self.per_tag[tag] = self.per_tag.get(tag, 0) + seconds
+        self.per_day_tag[(date, tag)] = self.per_day_tag.get((date, tag), 0) + seconds
+
+    def merge(self, other):
+        """
+        Add the totals of another summary, such as the one of another
+        database over the same range
+        """
+        self.total += other.total
+        self.sessions += other.sessions
+
+        for date, seconds in other.per_day.items():
+            self.per_day[date] = self.per_day.get(date, 0) + seconds
+
+        for tag, seconds in other.per_tag.items():
+            self.per_tag[tag] = self.per_tag.get(tag, 0) + seconds
+
+        for key, seconds in other.per_day_tag.items():
+            self.per_day_tag[key] = self.per_day_tag.get(key, 0) + seconds
+
+        return self
+
+    def days(self):
+        """
+        Get the (date, seconds) pairs sorted by date
+        """
+        return sorted(self.per_day.items())
+
+    def tags(self):
+        """
+        Get the (tag, seconds) pairs sorted by tag
+        """
+        return sorted(self.per_tag.items())
+
+    def to_dict(self):
+        """
+        Get the summary as plain JSON serializable data
+        """
+        return {
+            "start": self.start,
+            "end": self.end,
+            "total": self.total,
+            "sessions": self.sessions,
+            "per_day": dict(self.days()),
+            "per_tag": dict(self.tags()),
+            "per_day_tag": [
+                {"date": date, "tag": tag, "seconds": seconds}
+                for (date, tag), seconds in sorted(self.per_day_tag.items())
+            ],
+        }
+
+
+@dataclass
+class FocusSummary:
+    """
+    Statistics of the spans work sessions were running between two dates
+    (inclusive, YYYY-MM-DD): focus time, pauses and the focus time per
+    weekday and hour of the day, in seconds
+    """
+
+    start: str
+    end: str
+    focus: float = 0.0
+    spans: int = 0
+    sessions: int = 0
+    longest: float = 0.0
+    # heatmap[weekday][hour], Monday first, in local time
+    heatmap: list = field(default_factory=lambda: [[0.0] * 24 for _ in range(7)])
+    seen: set = field(default_factory=set, repr=False)
+
+    @property
+    def pauses(self):
+        """
+        Number of times a session was paused and resumed
+        """
+        return self.spans - self.sessions
+
+    def add(self, session_id, start, seconds):
+        """
+        Add a span of a session, started at the epoch timestamp start
+        """
+        self.focus += seconds
+        self.spans += 1
+        self.longest = max(self.longest, seconds)
+
+        if session_id not in self.seen:
+            self.seen.add(session_id)
+            self.sessions += 1
+
+        # Split the span at the hour boundaries
+        local = start + GMT_OFFSET * HOUR_FACTOR
+        remaining = seconds
+
+        while remaining > 0:
+            part = min(remaining, HOUR_FACTOR - local % HOUR_FACTOR)
+            # The epoch started on a Thursday
+            weekday = (int(local // DAY_FACTOR) + 3) % 7
+            hour = int(local % DAY_FACTOR // HOUR_FACTOR)
+            self.heatmap[weekday][hour] += part
+            local += part
+            remaining -= part
+
+    def merge(self, other):
+        """
+        Add the statistics of another summary, such as the one of another
+        database over the same range
+        """
+        self.focus += other.focus
+        self.spans += other.spans
+        self.sessions += other.sessions
+        self.longest = max(self.longest, other.longest)
+
+        for row, other_row in zip(self.heatmap, other.heatmap):
+            for hour, seconds in enumerate(other_row):
+                row[hour] += seconds
+
+        return self
+
+    def average(self):
+        """
+        Get the average length of a span
+        """
+        return self.focus / self.spans if self.spans else 0.0
+
+    def busiest_hour(self):
+        """
+        Get the hour of the day with the most focus time, or None
+        """
+        hours = [sum(row[hour] for row in self.heatmap) for hour in range(24)]
+
+        return hours.index(max(hours)) if self.focus else None
+
+    def to_dict(self):
+        """
+        Get the summary as plain JSON serializable data
+        """
+        return {
+            "start": self.start,
+            "end": self.end,
+            "focus": round(self.focus),
+            "spans": self.spans,
+            "sessions": self.sessions,
+            "pauses": self.pauses,
+            "average_span": round(self.average()),
+            "longest_span": round(self.longest),
+            "heatmap": {
+                weekday: [round(seconds) for seconds in row]
+                for weekday, row in zip(WEEKDAYS, self.heatmap)
+            },
+        }
@@ -5,7 +5,6 @@
 # Author: Lucas Araújo <araujolucas@dcc.ufmg.br>
 
 import sys
-import time
 
 from .polypomo import PolyPomo
 
@@ -17,8 +16,7 @@ def main():
 
     with PolyPomo() as polypomo:
         while True:
-            time.sleep(1)
-
+            # display() waits until there is something new to show
             try:
                 msg = polypomo.display()
 
@@ -21,7 +21,8 @@ class PolyPomo:
     """ """
 
     def __init__(self):
-        self.client = Client()
+        # The countdown is drawn locally, the server only sends state changes
+        self.client = Client(mode="sync")
 
     def __del__(self):
         self.client.close_connection()
@@ -36,7 +37,10 @@ class PolyPomo:
         """ """
 
         try:
-            data = self.client.get_status()
+            # Wait for a state change, or for the next second of a running
+            # timer
+            self.client.get_status(timeout=self.client.time_to_next_change())
+            data = self.client.current()
 
         except socket.timeout:
             self.client.reconnect()
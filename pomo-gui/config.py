@@ -14,7 +14,12 @@ class WINDOW:
     TITLE = "Pomodoro Timer"
     SIZE = "300x420"
     FONT = "Helvetica"
-    UPDATE_INTERVAL_MS = 1000
+    # Longest time between redraws, so changes pushed by the server (e.g. a
+    # suspend) show up while the timer is paused
+    MAX_UPDATE_INTERVAL_MS = 1000
+    # Time given to the reply of a command before redrawing
+    REPLY_INTERVAL_MS = 50
+    COALESCE_INTERVAL_MS = 150
 
 
 class CLOCK:
@@ -5,6 +5,7 @@
 # Author: Lucas Araújo <araujolucas@dcc.ufmg.br>
 
 import tkinter as tk
+import math
 import socket
 import json
 import subprocess
@@ -13,6 +14,7 @@ from tkinter import ttk
 from PIL import Image, ImageTk
 
 from pomo.client import Client
+from pomo.control import ControlClient
 from pomo.config import ICON
 
 from .config import COLOR, DRACULA_THEME
@@ -25,13 +27,18 @@ class PomodoroGUI:
         self.args = args
         self.darkmode = args.darkmode
 
+        # The countdown is drawn locally, the server only sends state changes
         if args.client:
-            self.client = Client()
+            self.client = Client(mode="sync")
         else:
             self.start_pomo_server()
-            self.client = Client()
+            self.client = Client(mode="sync")
+
+        # Replies carry the new status, so commands are shown right away
+        self.control = ControlClient(reply=True)
 
         self.status = "Pause"
+        self.display_job = None
         self.draw_gui()
         self.display()
 
@@ -284,10 +291,7 @@ class PomodoroGUI:
         if not new_text or new_text == old_text:
             return
 
-        try:
-            subprocess.run(["python3", "-m", "pomo", "tag", new_text])
-        except subprocess.CalledProcessError as e:
-            print(f"Error executing command: {e}")
+        self.send_command(self.control.tag, new_text)
 
     def middle_click_event(self, event):
         """
@@ -436,30 +440,17 @@ class PomodoroGUI:
         Display the timer
         """
         try:
-            data = self.client.get_status()
-
-            self.status = "Worktime" if data["status"] == "work" else "Breaktime"
-
-            if not data["active"]:
-                self.status = "Pause"
-
-            if self.status == "Worktime":
-                self.status_icon.config(fg=self.status_icon_worktime_fg)
-                self.update_pause_button()
-
-            elif self.status == "Breaktime":
-                self.status_icon.config(fg=self.status_icon_breaktime_fg)
-                self.update_pause_button()
+            # The server only sends state changes, so do not block the Tk loop
+            self.client.get_status(timeout=0)
 
-            else:
-                self.status_icon.config(fg=self.status_icon_pause_fg)
-                self.update_pause_button()
+            # Replies carry the status right after a command
+            reply = self.control.get_reply()
 
-            self.clock_label.config(text=f"{data['timer']}")
-            self.timer_tag.config(text=f"{data['tag']}")
-            self.status_icon.config(text=self.status)
+            if reply is not None:
+                self.client.apply(reply["status"])
 
-            self.update_progress_circle(data["remaining"], data["total_time"])
+            if self.client.state:
+                self.render(self.client.current())
 
         except socket.timeout:
             self.client.reconnect()
@@ -467,53 +458,107 @@ class PomodoroGUI:
         except json.JSONDecodeError:
             pass
 
-        # Schedule next update in 1000ms (1 second)
-        self.master.after(WINDOW.UPDATE_INTERVAL_MS, self.display)
+        # Redraw when the countdown shows another second, not on a fixed tick
+        self.schedule_display(self.next_update_ms())
+
+    def next_update_ms(self):
+        """
+        Get the time until the countdown shows another second, at most
+        WINDOW.MAX_UPDATE_INTERVAL_MS
+        """
+        delay = self.client.time_to_next_change()
+
+        if delay is None:
+            return WINDOW.MAX_UPDATE_INTERVAL_MS
+
+        return min(math.ceil(delay * 1000) + 1, WINDOW.MAX_UPDATE_INTERVAL_MS)
+
+    def schedule_display(self, delay_ms):
+        """
+        Schedule the next display, replacing the one already scheduled
+        """
+        if self.display_job is not None:
+            self.master.after_cancel(self.display_job)
+
+        self.display_job = self.master.after(delay_ms, self.display)
+
+    def render(self, data):
+        """
+        Render a status received from the server
+        """
+        self.status = "Worktime" if data["status"] == "work" else "Breaktime"
+
+        if not data["active"]:
+            self.status = "Pause"
+
+        if self.status == "Worktime":
+            self.status_icon.config(fg=self.status_icon_worktime_fg)
+            self.update_pause_button()
+
+        elif self.status == "Breaktime":
+            self.status_icon.config(fg=self.status_icon_breaktime_fg)
+            self.update_pause_button()
+
+        else:
+            self.status_icon.config(fg=self.status_icon_pause_fg)
+            self.update_pause_button()
+
+        self.clock_label.config(text=f"{data['timer']}")
+        self.timer_tag.config(text=f"{data['tag']}")
+        self.status_icon.config(text=self.status)
+
+        self.update_progress_circle(data["remaining"], data["total_time"])
+
+    def send_command(self, command, *args):
+        """
+        Send a command to the pomodoro without blocking the window
+        """
+        try:
+            command(*args)
+
+        except OSError as e:
+            print("Error occurred while sending the command:", e)
+            return
+
+        # Show the new status as soon as the reply arrives
+        self.schedule_display(WINDOW.REPLY_INTERVAL_MS)
+
+    def queue_time(self, seconds):
+        """
+        Queue a time change. Changes made in a short interval (e.g. several
+        scroll notches) are sent together as a single command
+        """
+        if not self.control.has_pending():
+            self.master.after(WINDOW.COALESCE_INTERVAL_MS, self.send_command, self.control.flush)
+
+        self.control.add_time(seconds)
 
     def toggle_timer(self):
         """
         Toggle the timer
         """
-        try:
-            subprocess.run(["python3", "-m", "pomo", "toggle"])
-        except Exception as e:
-            print("Error occurred while executing the command:", e)
+        self.send_command(self.control.toggle)
 
     def next_timer(self):
         """
         Skip to the next timer
         """
-        try:
-            subprocess.run(["python3", "-m", "pomo", "end"])
-        except Exception as e:
-            print("Error occurred while executing the command:", e)
+        self.send_command(self.control.end)
 
     def increment_timer(self):
         """
         Increment the timer
         """
-        try:
-            subprocess.run(["python3", "-m", "pomo", "time", "+60"])
-
-        except Exception as e:
-            print("Error occurred while executing the command:", e)
+        self.queue_time(60)
 
     def decrement_timer(self):
         """
         Decrement the timer
         """
-        try:
-            subprocess.run(["python3", "-m", "pomo", "time", "-60"])
-
-        except Exception as e:
-            print("Error occurred while executing the command:", e)
+        self.queue_time(-60)
 
     def toggle_lock(self):
         """
         Toggle the lock
         """
-        try:
-            subprocess.run(["python3", "-m", "pomo", "lock"])
-
-        except Exception as e:
-            print("Error occurred while executing the command:", e)
+        self.send_command(self.control.lock)
@@ -4,12 +4,11 @@
 # Created on: March  2, 2024
 # Author: Lucas Araújo <araujolucas@dcc.ufmg.br>
 
+import sys
 import argparse
-import pathlib
 
 from .validate_time import ValidateTime
 from .config import DB_FILE, DEFAULT_WORKTIME, DEFAULT_BREAKTIME, DEFAULT_TAG
-from .pomodoro import Pomodoro
 
 
 def parse_args():
@@ -32,7 +31,7 @@ def parse_args():
     )
     parser.add_argument(
         "-db",
-        "--database", type=pathlib.Path, default=DB_FILE, help="Path to database"
+        "--database", type=str, default=DB_FILE, help="Path to database"
     )
 
     parser.add_argument(
@@ -53,6 +52,10 @@ def parse_args():
     exit = sub.add_parser(
         "exit", help="exit any listening polypomo instances gracefully"
     )
+    status = sub.add_parser("status", help="print the current status as JSON")
+    metrics = sub.add_parser(
+        "metrics", help="print the queue depth and flush latency of the database writer"
+    )
     tag = sub.add_parser("tag", help="change the tag of the current timer")
     tag.add_argument("tag", help="New tag to be used")
 
@@ -72,20 +75,22 @@ def main():
     """
     args = parse_args()
 
-    pomodoro = Pomodoro(args)
+    # Only the daemon needs the timer, database and server modules, so they
+    # are imported here to keep the control subcommands fast to start
+    if args.action is None:
+        from .log_manager import LogManager
+        from .pomodoro import Pomodoro
+
+        # The daemon is the only process rotating the shared log file
+        LogManager(rotate=True)
+
+        pomodoro = Pomodoro(args)
+        pomodoro.action_display(args)
 
-    actions = {
-        "toggle": pomodoro.action_toggle,
-        "end": pomodoro.action_end,
-        "lock": pomodoro.action_lock,
-        "exit": pomodoro.action_exit,
-        "time": pomodoro.action_time,
-        "tag": pomodoro.action_change_tag,
-        None: pomodoro.action_display,
-    }
+    else:
+        from .commands import Commands
 
-    action_func = actions.get(args.action, pomodoro.action_display)
-    action_func(args)
+        sys.exit(Commands().run(args))
 
 
 if __name__ == "__main__":
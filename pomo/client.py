@@ -5,10 +5,12 @@
 # Author: Lucas Araújo <araujolucas@dcc.ufmg.br>
 
 import socket
-import json
+import select
 import time
 
 from .config import SERVER_SOCKFILE, PACKET_SIZE
+from .protocol import FrameReader, encode_frame
+from .utils import format_time, time_to_next_second
 
 RECONNECT_TIME = 5  # seconds
 
@@ -16,11 +18,19 @@ RECONNECT_TIME = 5  # seconds
 class Client:
     """
     Client class to get the status to the socket
+
+    mode is the stream mode asked to the server (see STREAM_MODES). Either
+    way, the frames are decoded into whole status dicts. In "sync" mode the
+    server is quiet while a timer runs, and current() gives the status
+    counted down locally
     """
 
-    def __init__(self):
-        self.client_socket = self.connect()
+    def __init__(self, mode="full"):
+        self.mode = mode
         self.connection = False
+        self.frame_reader = FrameReader()
+        self.state = {}
+        self.client_socket = self.connect()
 
     def __del__(self):
         self.close_connection()
@@ -41,6 +51,13 @@ class Client:
                 client_socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
                 client_socket.connect(SERVER_SOCKFILE)
                 self.connection = True
+                # Drop any partial frame left by a previous connection
+                self.frame_reader = FrameReader()
+                self.state = {}
+
+                if self.mode != "full":
+                    client_socket.sendall(encode_frame({"mode": self.mode}))
+
                 return client_socket
 
             except socket.error as e:
@@ -64,17 +81,83 @@ class Client:
             self.client_socket.close()
             self.connection = False
 
-    def get_status(self):
-        """
-        Get the status from the socket
+    def receive(self):
         """
+        Receive bytes from the socket and decode the complete frames
 
-        packet = self.client_socket.recv(PACKET_SIZE).decode()
+        Returns:
+            list: The status after each frame, oldest first
+        """
+        packet = self.client_socket.recv(PACKET_SIZE)
 
-        # If no data is received, raise a timeout
-        if packet == "":
+        # If no data is received, the server closed the connection
+        if packet == b"":
             raise socket.timeout
 
-        data = json.loads(packet)
+        return [self.apply(frame) for frame in self.frame_reader.feed(packet)]
+
+    def apply(self, frame):
+        """
+        Apply a frame to the last known status: a delta frame updates the
+        fields it carries, any other frame is a whole snapshot
+        """
+        if "delta" in frame:
+            self.state = {**self.state, **frame["delta"]}
+
+        else:
+            self.state = frame
+
+        return self.state
+
+    def is_readable(self, timeout=0):
+        """
+        Check if there is data waiting on the socket, waiting at most timeout
+        seconds
+        """
+        readable, _, _ = select.select([self.client_socket], [], [], timeout)
+        return bool(readable)
+
+    def get_status(self, timeout=None):
+        """
+        Get the newest status from the socket.
+        Waits until a complete frame arrives, then drains whatever else is
+        already buffered so stale frames are skipped.
+
+        The server only sends when the status changes, so with a timeout
+        this returns None if nothing new arrived in time
+        """
+        frames = []
+
+        while not frames:
+            if timeout is not None and not self.is_readable(timeout):
+                return None
+
+            frames = self.receive()
+
+        while self.is_readable():
+            frames.extend(self.receive())
+
+        return frames[-1]
+
+    def current(self):
+        """
+        Get the last received status, with the countdown of a running timer
+        advanced to now from its deadline
+        """
+        state = dict(self.state)
+
+        if state.get("deadline") is not None:
+            state["remaining"] = state["deadline"] - time.monotonic()
+            state["timer"] = format_time(state["remaining"])
+
+        return state
+
+    def time_to_next_change(self):
+        """
+        Get the time until current() shows another second, or None when the
+        timer is not running
+        """
+        if self.state.get("deadline") is None:
+            return None
 
-        return data
+        return time_to_next_second(self.state["deadline"] - time.monotonic())
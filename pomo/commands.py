@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+
+# Filename: commands.py
+# Created on: October 18, 2026
+# Author: Lucas Araújo <araujolucas@dcc.ufmg.br>
+
+import os
+import sys
+import json
+import time
+import socket
+
+from .config import SOCKFILE, EXIT_REPLY_TIMEOUT
+from .control import ControlClient
+
+
+class Commands:
+    """
+    Control subcommands of the command line, sent to the running pomodoro
+
+    Running one of them only imports the control client, not the daemon
+    modules, so they start as fast as possible (e.g. on a polybar click)
+    """
+
+    def run(self, args):
+        """
+        Run the subcommand selected in args
+
+        Returns:
+            int: The exit status of the program
+        """
+        actions = {
+            "toggle": self.action_toggle,
+            "end": self.action_end,
+            "lock": self.action_lock,
+            "exit": self.action_exit,
+            "time": self.action_time,
+            "tag": self.action_change_tag,
+            "status": self.action_status,
+            "metrics": self.action_metrics,
+        }
+
+        try:
+            if actions[args.action](args) is False:
+                return 1
+
+        except (FileNotFoundError, ConnectionRefusedError) as e:
+            sys.stderr.write(f"No instance of pomodoro listening, error: {e}\n")
+            return 1
+
+        except socket.timeout as e:
+            sys.stderr.write(f"{e}\n")
+            return 1
+
+        return 0
+
+    def action_toggle(self, args):
+        """
+        Toggle the timer
+        """
+        with ControlClient() as control:
+            control.toggle()
+
+    def action_end(self, args):
+        """
+        End the timer
+        """
+        with ControlClient() as control:
+            control.end()
+
+    def action_lock(self, args):
+        """
+        Lock the timer
+        """
+        with ControlClient() as control:
+            control.lock()
+
+    def action_time(self, args):
+        """
+        Change the timer
+        """
+        op, seconds = args.delta
+
+        with ControlClient() as control:
+            control.add_time(int(seconds) if op == "add" else -int(seconds))
+
+    def action_change_tag(self, args):
+        """
+        Change the tag
+        """
+        with ControlClient() as control:
+            control.tag(args.tag)
+
+    def action_status(self, args):
+        """
+        Print the current status as JSON
+        """
+        with ControlClient() as control:
+            reply = control.request([])
+
+        print(json.dumps(reply["status"]))
+
+    def action_metrics(self, args):
+        """
+        Print the metrics of the database writer as JSON
+        """
+        with ControlClient() as control:
+            reply = control.request(["metrics"])
+
+        print(json.dumps(reply["results"][0].get("metrics")))
+
+    def action_exit(self, args):
+        """
+        Exit the timer, waiting for the pomodoro to release its socket
+
+        Returns:
+            bool: False if the pomodoro did not reply or did not release its
+                  socket in time. True if no pomodoro was running
+        """
+        with ControlClient() as control:
+            try:
+                # The reply is sent once the pomodoro saved its journal, so
+                # a new instance started right after replays the final state
+                control.request(["exit"], timeout=EXIT_REPLY_TIMEOUT)
+
+            except (FileNotFoundError, ConnectionRefusedError):
+                # Nothing to stop
+                return True
+
+            except socket.timeout:
+                sys.stderr.write("The pomodoro did not reply to the exit request\n")
+                return False
+
+        return self.wait_for_socket_cleanup()
+
+    def wait_for_socket_cleanup(self, tries=20, wait=0.5):
+        """
+        Wait for the socket to be removed
+        """
+        for i in range(tries):
+            if not os.path.exists(SOCKFILE):
+                return True
+            else:
+                time.sleep(wait)
+
+        return False
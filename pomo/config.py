@@ -11,8 +11,28 @@ SOCKFILE = os.path.join(SOCKDIR, "pomo.sock")
 SERVER_SOCKFILE = os.path.join(SOCKDIR, "server-pomo.sock")
 
 LOGFILE = "/tmp/pomo.log"
+LOG_LEVEL = os.environ.get("POMO_LOG_LEVEL", "INFO")  # DEBUG, INFO, WARN or ERROR
+LOG_MAX_BYTES = 1024 * 1024  # Rotate the log file past this size
+LOG_BACKUP_COUNT = 3
+LOG_BUFFER_RECORDS = 32  # Records buffered before writing to the log file
 DB_FILE = "~/.config/pomo/pomo.db"
 DB_TABLE_NAME = "sessions"
+DB_ROLLUP_TABLE_NAME = "daily_tag_rollup"
+DB_META_TABLE_NAME = "meta"
+DB_INTERVALS_TABLE_NAME = "session_intervals"
+INTERVALS_BATCH_SIZE = 16  # Active spans kept in memory before writing them
+DB_WRITER_QUEUE_SIZE = 256  # Writes queued for the writer thread, later ones wait in memory
+DB_WRITER_RETRIES = 5  # Attempts at a batch of writes counted as one failure, or given up on exit
+DB_WRITER_RETRY_DELAY = 0.5  # seconds
+DB_WRITER_FLUSH_TIMEOUT = 5  # seconds the daemon waits for queued writes on exit
+DB_CACHED_STATEMENTS = 64
+EXPORT_BATCH_SIZE = 5000  # Rows read at a time when exporting sessions
+IMPORT_BATCH_SIZE = 50000  # Rows written per transaction when importing sessions
+ANALYTICS_WORKERS = None  # Processes summarizing many databases, None for one per CPU
+ANALYTICS_CACHE_DIR = os.path.join(
+    os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache")), "pomo"
+)
+ANALYTICS_CACHE_ENTRIES = 64  # Date ranges kept in the cache of each database
 
 DEFAULT_TAG = "other"
 
@@ -29,7 +49,31 @@ GMT_OFFSET = -3  # Greenwich Mean Time
 DEFAULT_WORKTIME = 40 * MINUTE_FACTOR
 DEFAULT_BREAKTIME = 10 * MINUTE_FACTOR
 
+# Suspend detection backend ("clock", "logind" or "off") and the minimum
+# clock gap, in seconds, taken as a suspend
+SUSPEND_BACKEND = "clock"
+SUSPEND_GAP_THRESHOLD = 5
+
+# Journal of timer transitions kept next to the database, replayed when the
+# daemon starts. A running timer is checkpointed every
+# JOURNAL_CHECKPOINT_INTERVAL seconds, and resumes running after a restart
+# only if the daemon was down for at most JOURNAL_RESUME_GAP seconds
+JOURNAL_SUFFIX = ".journal"
+JOURNAL_CHECKPOINT_INTERVAL = 30
+JOURNAL_COMPACT_RECORDS = 1000
+JOURNAL_CLOSE_TIMEOUT = 5  # seconds the daemon waits for queued records on exit
+JOURNAL_RESUME_GAP = 5 * MINUTE_FACTOR
+
 PACKET_SIZE = 1024
+DATAGRAM_SIZE = 64 * 1024  # Largest command request or reply
+CONTROL_REPLY_TIMEOUT = 1  # seconds
+# The daemon replies to exit once its writes and journal are on disk
+EXIT_REPLY_TIMEOUT = DB_WRITER_FLUSH_TIMEOUT + JOURNAL_CLOSE_TIMEOUT + CONTROL_REPLY_TIMEOUT
+
+# Unread bytes a status client may accumulate before frames are skipped for
+# it, and how many consecutive skipped frames get it disconnected
+SERVER_CLIENT_BACKLOG = 16 * PACKET_SIZE
+SERVER_MAX_SKIPPED_FRAMES = 30
 SOCKET_TIMEOUT = 1e-6
 
 
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+
+# Filename: control.py
+# Created on: October 18, 2026
+# Author: Lucas Araújo <araujolucas@dcc.ufmg.br>
+
+import socket
+import select
+import time
+
+from .config import SOCKFILE, DATAGRAM_SIZE, CONTROL_REPLY_TIMEOUT
+from .protocol import encode_message, decode_message
+
+
+class ControlClient:
+    """
+    Client class to send commands to the running pomodoro over its datagram
+    socket, without blocking the caller
+
+    Commands are sent as requests holding a batch of actions. When reply is
+    set, the pomodoro answers each request with the result of every action
+    and the resulting status, which can be read with get_reply()
+
+    Time changes are queued and coalesced until the next request or flush(),
+    so a burst of them (e.g. scrolling over the GUI clock) becomes a single
+    action
+    """
+
+    def __init__(self, sockfile=SOCKFILE, reply=False):
+        self.sockfile = sockfile
+        self.reply = reply
+        self.sock = None
+        self.pending_time = 0
+        self.last_request_id = 0
+
+    def __del__(self):
+        self.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.flush()
+
+        self.close()
+
+    def connect(self):
+        """
+        Connect to the command socket of the pomodoro
+        """
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        sock.setblocking(False)
+
+        try:
+            # Bind to an automatic abstract address, so replies can be sent back
+            sock.bind("")
+            sock.connect(self.sockfile)
+
+        except OSError:
+            sock.close()
+            raise
+
+        self.sock = sock
+
+    def close(self):
+        """
+        Close the socket
+        """
+        if self.sock is not None:
+            self.sock.close()
+            self.sock = None
+
+    def send_message(self, data):
+        """
+        Send a datagram to the pomodoro.
+        Raises FileNotFoundError or ConnectionRefusedError if no pomodoro is
+        listening
+        """
+        if self.sock is None:
+            self.connect()
+
+        try:
+            self.sock.send(data)
+
+        except ConnectionRefusedError:
+            # The pomodoro may have been restarted on a new socket
+            self.close()
+            self.connect()
+            self.sock.send(data)
+
+    def submit(self, commands, reply=None):
+        """
+        Send a batch of actions, preceded by the queued time changes, in a
+        single request without waiting for the reply
+
+        Returns:
+            int: The id of the request, repeated in its reply
+        """
+        commands = self.take_pending() + list(commands)
+
+        self.last_request_id += 1
+        request = {
+            "id": self.last_request_id,
+            "commands": commands,
+            "reply": self.reply if reply is None else reply,
+        }
+
+        self.send_message(encode_message(request))
+
+        return self.last_request_id
+
+    def request(self, commands, timeout=CONTROL_REPLY_TIMEOUT):
+        """
+        Send a batch of actions and wait for the reply.
+        Raises socket.timeout if it does not arrive in time
+
+        Returns:
+            dict: The reply, with the result of each action in "results"
+                  and the resulting status in "status"
+        """
+        request_id = self.submit(commands, reply=True)
+        deadline = time.monotonic() + timeout
+
+        while True:
+            remaining = max(deadline - time.monotonic(), 0)
+
+            if not self.is_readable(remaining):
+                raise socket.timeout("No reply from the pomodoro")
+
+            reply = decode_message(self.sock.recv(DATAGRAM_SIZE))
+
+            # Skip replies to earlier requests
+            if reply.get("id") == request_id:
+                return reply
+
+    def is_readable(self, timeout=0):
+        """
+        Check if there is a reply waiting on the socket, waiting at most
+        timeout seconds
+        """
+        if self.sock is None:
+            return False
+
+        readable, _, _ = select.select([self.sock], [], [], timeout)
+        return bool(readable)
+
+    def get_reply(self, timeout=0):
+        """
+        Get the newest reply received, or None
+        """
+        reply = None
+
+        while self.is_readable(timeout):
+            reply = decode_message(self.sock.recv(DATAGRAM_SIZE))
+            timeout = 0
+
+        return reply
+
+    def take_pending(self):
+        """
+        Take the queued time changes as a list of actions
+        """
+        seconds, self.pending_time = self.pending_time, 0
+
+        if not seconds:
+            return []
+
+        op = "add" if seconds > 0 else "sub"
+        return [f"time {op} {abs(seconds)}"]
+
+    def has_pending(self):
+        """
+        Whether there are queued time changes
+        """
+        return self.pending_time != 0
+
+    def flush(self):
+        """
+        Send the queued time changes
+        """
+        if self.has_pending():
+            self.submit([])
+
+    def toggle(self):
+        """
+        Start/stop the timer
+        """
+        self.submit(["toggle"])
+
+    def end(self):
+        """
+        End the current timer
+        """
+        self.submit(["end"])
+
+    def lock(self):
+        """
+        Toggle the lock of time changes
+        """
+        self.submit(["lock"])
+
+    def exit(self):
+        """
+        Ask the pomodoro to exit
+        """
+        self.submit(["exit"])
+
+    def tag(self, tag):
+        """
+        Change the tag of the current timer
+        """
+        self.submit([f"tag {tag}"])
+
+    def add_time(self, seconds):
+        """
+        Queue a change of the current timer, in seconds (negative to remove)
+        """
+        self.pending_time += int(seconds)
@@ -5,31 +5,65 @@
 # Author: Lucas Araújo <araujolucas@dcc.ufmg.br>
 
 import sqlite3
+import calendar
 import os
+import time
+import threading
+from urllib.parse import quote
 from datetime import datetime, timedelta
 from contextlib import contextmanager
 
 from .log_manager import LogManager
-from .config import DB_FILE, DB_TABLE_NAME, GMT_OFFSET
+from .db_schema import DBSchema
+from .db_statements import SQL
+from .config import (
+    DB_FILE,
+    GMT_OFFSET,
+    DAY_FACTOR,
+    HOUR_FACTOR,
+    DB_CACHED_STATEMENTS,
+    EXPORT_BATCH_SIZE,
+)
 
 
 class DBManager:
-    """ """
+    """
+    Database manager keeping one long-lived connection per thread
 
-    def __init__(self, database=DB_FILE):
+    A read_only manager never writes to the database file, e.g. the one of
+    a teammate: it is not migrated, and its journal mode is left as is
+    """
+
+    def __init__(self, database=DB_FILE, read_only=False):
         self.log_manager = LogManager()
-        self.database = database
-        self.pending_db_update = False
+        self.database = os.path.expanduser(database)
+        self.read_only = read_only
+        # Id and start of the session waiting for finish_session, if any
+        self.session_id = None
+        self.session_start_ts = None
+
+        # Connections are opened lazily, one per thread, and reused until close()
+        self.connections = {}
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.schema_ready = False
 
     def __del__(self):
         pass
 
+    @property
+    def pending_db_update(self):
+        """
+        Whether a session was created and not finished yet
+        """
+        return self.session_id is not None
+
     def ensure_dir(self, file_path):
         """
         Ensure the directory of the file exists
         """
         directory = os.path.dirname(file_path)
-        if not os.path.exists(directory):
+        if directory and not os.path.exists(directory):
             try:
                 os.makedirs(directory)
                 self.log_manager.log(f"Created directory {directory}", level="DEBUG")
@@ -42,118 +76,407 @@ class DBManager:
 
         return True
 
-    @contextmanager
-    def setup_connection(self, path):
+    def fail(self, error):
+        """
+        Give up on the database: exit the program from the main thread, and
+        raise the error from any other, e.g. the daemon writer thread, so
+        the thread can recover
+        """
+        if threading.current_thread() is threading.main_thread():
+            exit(1)
+
+        raise error
+
+    def open_connection(self):
         """
-        Setup the connection to the database
+        Open a new connection to the database, creating the file and the
+        schema the first time it is called
         """
+        path = self.database
 
-        # check if the database exist
-        path = os.path.expanduser(path)
+        if self.read_only:
+            return self.open_read_only()
 
-        if not os.path.isfile(path):
+        if not self.schema_ready and not os.path.isfile(path):
             self.log_manager.log(
                 f"Database {path} does not exist, creating it...", level="DEBUG"
             )
 
-            if self.ensure_dir(path):
-                try:
-                    with open(path, "w") as f:
-                        f.write("")
+            if not self.ensure_dir(path):
+                self.fail(sqlite3.OperationalError(f"Cannot create the directory of {path}"))
+
+        try:
+            # The connection may be closed from another thread on shutdown
+            connection = sqlite3.connect(
+                path, check_same_thread=False, cached_statements=DB_CACHED_STATEMENTS
+            )
+        except sqlite3.OperationalError as e:
+            self.log_manager.log(
+                f"Error opening database {path}: {e}", level="ERROR"
+            )
+            self.fail(e)
 
-                except FileNotFoundError:
-                    self.log_manager.log(
-                        f"Error creating database {path}. File not found.",
-                        level="ERROR",
-                    )
-                    exit(1)
-            else:
-                exit(1)
+        # WAL lets the analytics readers run alongside the daemon writes, and
+        # with it a NORMAL sync level only fsyncs on checkpoints
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
 
-        session = sqlite3.connect(path)
-        cur = session.cursor()
-        self.create_table(session, cur)
+        if not self.schema_ready:
+            DBSchema().ensure(connection)
+            self.schema_ready = True
 
         self.log_manager.log(f"Connected to database: {path}", level="INFO")
 
+        return connection
+
+    def open_read_only(self):
+        """
+        Open a new read-only connection to the database. A database with an
+        older schema is copied to memory and migrated there, and a missing
+        one is read as an empty database
+        """
+        path = self.database
+        schema = DBSchema()
+        connection = None
+
+        if os.path.isfile(path):
+            try:
+                connection = sqlite3.connect(
+                    f"file:{quote(path)}?mode=ro",
+                    uri=True,
+                    check_same_thread=False,
+                    cached_statements=DB_CACHED_STATEMENTS,
+                )
+                version = schema.get_version(connection)
+
+            except sqlite3.Error as e:
+                self.log_manager.log(
+                    f"Error opening database {path}: {e}", level="ERROR"
+                )
+                self.fail(e)
+
+            if version >= schema.VERSION:
+                self.log_manager.log(f"Connected to database: {path} (read-only)", level="INFO")
+                return connection
+
+        memory = sqlite3.connect(
+            ":memory:", check_same_thread=False, cached_statements=DB_CACHED_STATEMENTS
+        )
+
+        if connection is not None:
+            connection.backup(memory)
+            connection.close()
+
+        schema.ensure(memory)
+        self.log_manager.log(
+            f"Loaded database {path} in memory with schema version {schema.VERSION}",
+            level="INFO",
+        )
+
+        return memory
+
+    def get_connection(self):
+        """
+        Get the connection owned by the calling thread
+        """
+        thread_id = threading.get_ident()
+
+        with self.lock:
+            connection = self.connections.get(thread_id)
+
+            if connection is None:
+                connection = self.open_connection()
+                self.connections[thread_id] = connection
+
+        return connection
+
+    def close(self):
+        """
+        Close every pooled connection
+        """
+        with self.lock:
+            connections = list(self.connections.values())
+            self.connections.clear()
+
+        for connection in connections:
+            connection.close()
+
+        if connections:
+            self.log_manager.log("Closed database connections", level="INFO")
+
+    @contextmanager
+    def transaction(self):
+        """
+        Yield a cursor on the pooled connection of the calling thread.
+        The outermost transaction commits on success and rolls back on error
+        """
+        connection = self.get_connection()
+        depth = getattr(self.local, "depth", 0)
+        self.local.depth = depth + 1
+
         try:
-            yield cur
+            yield connection.cursor()
+
+        except Exception:
+            if depth == 0:
+                connection.rollback()
+            raise
+
+        else:
+            if depth == 0:
+                connection.commit()
+
         finally:
-            self.log_manager.log("Closing database connection", level="INFO")
-            session.commit()
-            session.close()
+            self.local.depth = depth
+
+    def local_datetime(self, timestamp):
+        """
+        Convert an epoch timestamp to the GMT_OFFSET local datetime used by
+        the date and start columns
+        """
+        return datetime.utcfromtimestamp(timestamp) + timedelta(hours=GMT_OFFSET)
+
+    def local_timestamp(self, local):
+        """
+        Convert a GMT_OFFSET local datetime back to an epoch timestamp, the
+        inverse of local_datetime
+        """
+        return calendar.timegm(local.timetuple()) - GMT_OFFSET * HOUR_FACTOR
+
+    def date_to_timestamp(self, date):
+        """
+        Convert a YYYY-MM-DD date to the epoch timestamp of its local midnight
+        """
+        return self.local_timestamp(datetime.strptime(date, "%Y-%m-%d"))
+
+    def today(self):
+        """
+        Get the current date in the format of the date column
+        """
+        return self.local_datetime(time.time()).strftime("%Y-%m-%d")
+
+    def bump_version(self, session, date=None):
+        """
+        Mark the data as changed: data_version for writes to the current
+        day, history_version for writes to any other day or to unknown
+        days. Must run inside the transaction of the write
+        """
+        key = "data_version" if date == self.today() else "history_version"
+        session.execute(SQL.BUMP_VERSION, (key,))
+
+    def get_versions(self):
+        """
+        Get the (database_id, history_version, data_version, last_day)
+        identity and counters of the database, last_day being the latest
+        day with a finished session, or None
+        """
+        with self.transaction() as session:
+            return session.execute(SQL.VERSIONS).fetchone()
+
+    def create_session(self, tag, start_ts=None):
+        """
+        Create a session in the database, started at start_ts or now
+        """
+        if self.pending_db_update:
+            return
 
-    def create_table(self, session, cursor):
+        if start_ts is None:
+            start_ts = int(time.time())
+        current_time_gmt = self.local_datetime(start_ts)
+        formatted_date = current_time_gmt.strftime("%Y-%m-%d")
+        formatted_time = current_time_gmt.strftime("%H:%M:%S")
+
+        with self.transaction() as session:
+            session.execute(
+                SQL.INSERT_SESSION, (formatted_date, formatted_time, start_ts, tag)
+            )
+            self.session_id = session.lastrowid
+            self.session_start_ts = start_ts
+
+        self.log_manager.log(f"Created session {self.session_id} in database", level="INFO")
+
+    def add_intervals(self, intervals):
         """
-        Create the table in the database
+        Write (start, stop, start_mono, stop_mono) spans of the open session
         """
-        cursor.execute(
-            f"""CREATE TABLE IF NOT EXISTS '{DB_TABLE_NAME}' (
-                            date TEXT,
-                            start TEXT,
-                            duration INTEGER,
-                            tag TEXT);
-                       """
+        if not self.pending_db_update or not intervals:
+            return
+
+        with self.transaction() as session:
+            session.executemany(
+                SQL.INSERT_INTERVAL, ((self.session_id,) + tuple(i) for i in intervals)
+            )
+
+        self.log_manager.log(
+            f"Wrote {len(intervals)} intervals of session {self.session_id}", level="DEBUG"
         )
-        session.commit()
 
-    def create_session(self, tag):
+    def finish_session(self, duration, intervals=()):
         """
-        Create a session in the database
+        Finish the session in the database and add it to the rollup table.
+        The duration is the sum of the spans of the session, or the given
+        duration for sessions without spans
         """
-        with self.setup_connection(self.database) as session:
-            if not self.pending_db_update:
-                current_time_gmt = datetime.utcnow() + timedelta(hours=GMT_OFFSET)
-                formatted_date = current_time_gmt.strftime("%Y-%m-%d")
-                formatted_time = current_time_gmt.strftime("%H:%M:%S")
+        if not self.pending_db_update:
+            return
 
-                session.execute(
-                    f"INSERT INTO '{DB_TABLE_NAME}' VALUES ('{formatted_date}', '{formatted_time}', NULL, '{tag}');"
-                )
-                self.log_manager.log("Created session in database", level="INFO")
-                self.pending_db_update = True
-
-    def finish_session(self, duration):
-        """
-        Finish the session in the database
-        """
-        with self.setup_connection(self.database) as session:
-            if self.pending_db_update:
-                session.execute(
-                    f"""UPDATE '{DB_TABLE_NAME}'
-                        SET duration = '{int(duration)}'
-                        WHERE start IN (
-                            SELECT start FROM '{DB_TABLE_NAME}'
-                            ORDER BY date DESC, start DESC
-                            LIMIT 1);
-                    """
-                )
+        with self.transaction() as session:
+            self.add_intervals(intervals)
+            active, = session.execute(SQL.SESSION_ACTIVE_TIME, (self.session_id,)).fetchone()
+            duration = round(active) if active is not None else int(duration)
+
+            session.execute(SQL.FINISH_SESSION, (duration, self.session_id))
+            date, tag, _ = session.execute(SQL.SELECT_SESSION, (self.session_id,)).fetchone()
+            session.execute(SQL.ADD_TO_ROLLUP, (date, tag, duration, 1))
+            self.bump_version(session, date)
+
+        self.log_manager.log(f"Finished session {self.session_id} in database", level="INFO")
+        self.session_id = None
+        self.session_start_ts = None
+
+    def resume_session(self, start_ts, tag=None):
+        """
+        Take over the unfinished session started at start_ts, e.g. the one
+        left open by a previous instance. If it is missing, which happens
+        when the previous instance stopped before writing it, it is created
+        with the given tag. If it is finished already, e.g. when writes of
+        a previous instance are replayed, no session is left open
+
+        Returns:
+            bool: True if the session was found
+        """
+        with self.transaction() as session:
+            row = session.execute(SQL.SESSION_AT, (start_ts,)).fetchone()
+
+        self.session_id = None
+        self.session_start_ts = None
 
-                self.log_manager.log("Finished session in database", level="INFO")
-                self.pending_db_update = False
+        if row is None:
+            self.log_manager.log(f"No session started at {start_ts}", level="WARN")
+            self.create_session(tag, start_ts)
+            return False
+
+        session_id, duration = row
+
+        if duration is not None:
+            self.log_manager.log(f"Session {session_id} is finished already", level="INFO")
+            return True
+
+        self.session_id = session_id
+        self.session_start_ts = start_ts
+        self.log_manager.log(f"Resumed session {self.session_id} in database", level="INFO")
+
+        return True
 
     def update_tag(self, tag):
         """
-        Update the tag in the database
-        """
-        with self.setup_connection(self.database) as session:
-            if self.pending_db_update:
-                session.execute(
-                    f"""UPDATE '{DB_TABLE_NAME}'
-                    SET tag = '{tag}'
-                    WHERE start IN (
-                        SELECT start FROM '{DB_TABLE_NAME}'
-                        ORDER BY date DESC, start DESC
-                        LIMIT 1);
-                    """
-                )
+        Update the tag of the open session in the database. The session is
+        not finished, so it is not in the rollup table yet
+        """
+        if not self.pending_db_update:
+            return
+
+        with self.transaction() as session:
+            date, _, _ = session.execute(SQL.SELECT_SESSION, (self.session_id,)).fetchone()
+            session.execute(SQL.UPDATE_TAG, (tag, self.session_id))
+            self.bump_version(session, date)
+
+        self.log_manager.log(f"Updated tag of session {self.session_id} in database", level="INFO")
+
+    def import_sessions(self, rows):
+        """
+        Insert (date, start, start_ts, duration, tag) rows in a single
+        transaction, skipping sessions whose start and tag already exist,
+        and update the rollup of the days they belong to
+
+        Returns:
+            int: The number of inserted sessions
+        """
+        # Iterated twice, for the sessions and for their days
+        rows = list(rows)
+
+        with self.transaction() as session:
+            session.executemany(
+                SQL.IMPORT_SESSION, (row + (row[2], row[4]) for row in rows)
+            )
+            inserted = session.rowcount
+
+            days = {(row[0],) for row in rows}
+            session.executemany(SQL.DELETE_ROLLUP_DAY, days)
+            session.executemany(SQL.ROLLUP_DAY, days)
+            self.bump_version(session)
+
+        return inserted
+
+    def rebuild_rollup(self):
+        """
+        Recompute the rollup table from the sessions table
+        """
+        with self.transaction() as session:
+            DBSchema().rebuild_rollup(session)
+            self.bump_version(session)
+
+        self.log_manager.log("Rebuilt the rollup table", level="INFO")
+
+    def query_range(self, start, end, group_by=None):
+        """
+        Query the sum of durations of the sessions between the start and end
+        dates (inclusive, YYYY-MM-DD), optionally grouped by "date" or "tag".
+
+        Returns:
+            list: [(total,)] without grouping, [(key, total), ...] otherwise
+        """
+        if group_by not in SQL.RANGE:
+            raise ValueError(f"Invalid group_by {group_by!r}")
+
+        return self.perform_query(SQL.RANGE[group_by], (start, end))
+
+    def iter_rollup(self, start, end):
+        """
+        Iterate over the (date, tag, seconds, count) totals between the start
+        and end dates (inclusive, YYYY-MM-DD)
+        """
+        with self.transaction() as session:
+            yield from session.execute(SQL.ROLLUP_RANGE, (start, end))
+
+    def iter_intervals(self, start, end):
+        """
+        Iterate over the (session_id, start, seconds, tag) spans started
+        between the start and end dates (inclusive, YYYY-MM-DD)
+        """
+        first = self.date_to_timestamp(start)
+        last = self.date_to_timestamp(end) + DAY_FACTOR
+
+        with self.transaction() as session:
+            yield from session.execute(SQL.INTERVALS_RANGE, (first, last))
+
+    def iter_sessions(self, start=None, end=None, batch_size=EXPORT_BATCH_SIZE):
+        """
+        Iterate over the sessions between the start and end dates (inclusive,
+        YYYY-MM-DD), or over all of them, in lists of at most batch_size
+        (id, date, start, start_ts, duration, tag) rows. Only one batch is
+        held in memory at a time
+        """
+        if start is None and end is None:
+            query, params = SQL.SESSIONS_ALL, ()
+        else:
+            query, params = SQL.SESSIONS_RANGE, (start or "", end or "9999-12-31")
+
+        with self.transaction() as session:
+            cursor = session.execute(query, params)
+
+            while True:
+                rows = cursor.fetchmany(batch_size)
+
+                if not rows:
+                    break
 
-                self.log_manager.log("Updated tag in database", level="INFO")
+                yield rows
 
-    def perform_query(self, query):
+    def perform_query(self, query, params=()):
         """
         Perform a query in the database
         """
-        with self.setup_connection(self.database) as session:
+        with self.transaction() as session:
             self.log_manager.log(f"Performing query: {query}", level="DEBUG")
-            return session.execute(query).fetchall()
+            return session.execute(query, params).fetchall()
@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+
+# Filename: db_schema.py
+# Created on: October 18, 2026
+# Author: Lucas Araújo <araujolucas@dcc.ufmg.br>
+
+from .log_manager import LogManager
+from .config import (
+    DB_TABLE_NAME,
+    DB_ROLLUP_TABLE_NAME,
+    DB_META_TABLE_NAME,
+    DB_INTERVALS_TABLE_NAME,
+    GMT_OFFSET,
+    HOUR_FACTOR,
+)
+
+
+class DBSchema:
+    """
+    Versioned schema of the sessions database
+
+    The version is kept in SQLite's user_version pragma. Version 0 is the
+    original unkeyed 'sessions' table, every later version is reached by
+    applying the migrations in order
+    """
+
+    VERSION = 6
+
+    def __init__(self):
+        self.log_manager = LogManager()
+
+    def get_version(self, connection):
+        """
+        Get the schema version stored in the database
+        """
+        return connection.execute("PRAGMA user_version").fetchone()[0]
+
+    def has_table(self, connection, name):
+        """
+        Check if a table exists in the database
+        """
+        row = connection.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (name,)
+        ).fetchone()
+
+        return row is not None
+
+    def ensure(self, connection):
+        """
+        Create or migrate the schema up to the current version
+        """
+        if self.get_version(connection) == self.VERSION:
+            return
+
+        # Take the write lock before checking again, so two processes opening
+        # the same old database do not both migrate it
+        connection.execute("BEGIN IMMEDIATE")
+
+        try:
+            version = self.get_version(connection)
+
+            if version == 0 and not self.has_table(connection, DB_TABLE_NAME):
+                self.create(connection)
+                self.log_manager.log(
+                    f"Created schema version {self.VERSION}", level="INFO"
+                )
+
+            else:
+                for target in range(version + 1, self.VERSION + 1):
+                    getattr(self, f"migrate_to_v{target}")(connection)
+                    self.log_manager.log(
+                        f"Migrated schema to version {target}", level="INFO"
+                    )
+
+            connection.execute(f"PRAGMA user_version = {self.VERSION}")
+
+        except Exception:
+            connection.rollback()
+            raise
+
+        connection.commit()
+
+    def create(self, connection):
+        """
+        Create the latest schema on an empty database
+        """
+        connection.execute(
+            f"""CREATE TABLE '{DB_TABLE_NAME}' (
+                    id INTEGER PRIMARY KEY,
+                    date TEXT,
+                    start TEXT,
+                    start_ts INTEGER,
+                    duration INTEGER,
+                    tag TEXT);
+            """
+        )
+        self.create_indexes(connection)
+        self.create_rollup(connection)
+        self.create_meta(connection)
+        self.create_intervals(connection)
+
+    def create_indexes(self, connection):
+        """
+        Create the indexes of the sessions table
+        """
+        connection.execute(
+            f"CREATE INDEX IF NOT EXISTS idx_{DB_TABLE_NAME}_date ON '{DB_TABLE_NAME}' (date)"
+        )
+        connection.execute(
+            f"CREATE INDEX IF NOT EXISTS idx_{DB_TABLE_NAME}_tag ON '{DB_TABLE_NAME}' (tag)"
+        )
+        connection.execute(
+            f"""CREATE INDEX IF NOT EXISTS idx_{DB_TABLE_NAME}_start_tag
+                ON '{DB_TABLE_NAME}' (start_ts, tag)"""
+        )
+
+    def migrate_to_v1(self, connection):
+        """
+        Add the integer session id, the epoch start column and the indexes.
+        Rows are copied in chronological order so ids follow the history
+        """
+        legacy = f"{DB_TABLE_NAME}_v0"
+
+        connection.execute(f"ALTER TABLE '{DB_TABLE_NAME}' RENAME TO '{legacy}'")
+        self.create(connection)
+
+        # date and start are stored in GMT_OFFSET local time, while start_ts
+        # is a plain UTC epoch
+        connection.execute(
+            f"""INSERT INTO '{DB_TABLE_NAME}' (date, start, start_ts, duration, tag)
+                SELECT date,
+                       start,
+                       CAST(strftime('%s', date || ' ' || start) AS INTEGER)
+                           - {GMT_OFFSET * HOUR_FACTOR},
+                       duration,
+                       tag
+                FROM '{legacy}'
+                ORDER BY date, start;
+            """
+        )
+        connection.execute(f"DROP TABLE '{legacy}'")
+
+    def create_rollup(self, connection):
+        """
+        Create the table holding the total duration and number of finished
+        sessions per day and tag, kept up to date by DBManager
+        """
+        connection.execute(
+            f"""CREATE TABLE IF NOT EXISTS '{DB_ROLLUP_TABLE_NAME}' (
+                    date TEXT NOT NULL,
+                    tag TEXT NOT NULL,
+                    seconds INTEGER NOT NULL,
+                    count INTEGER NOT NULL,
+                    PRIMARY KEY (date, tag)) WITHOUT ROWID;
+            """
+        )
+
+    def create_meta(self, connection):
+        """
+        Create the table of counters bumped by DBManager on every write,
+        which lets readers such as the analytics cache detect changes.
+        history_version counts changes to past days, data_version the ones
+        to the current day, and the random database_id tells databases
+        found at the same path apart
+        """
+        connection.execute(
+            f"""CREATE TABLE IF NOT EXISTS '{DB_META_TABLE_NAME}' (
+                    key TEXT PRIMARY KEY,
+                    value INTEGER NOT NULL) WITHOUT ROWID;
+            """
+        )
+        connection.execute(
+            f"""INSERT OR IGNORE INTO '{DB_META_TABLE_NAME}' (key, value)
+                VALUES ('history_version', 0), ('data_version', 0), ('database_id', random());
+            """
+        )
+
+    def create_intervals(self, connection):
+        """
+        Create the table of the spans a work session was running, in wall
+        clock (epoch) and monotonic seconds. The duration of a span is
+        measured on the monotonic clock
+        """
+        connection.execute(
+            f"""CREATE TABLE IF NOT EXISTS '{DB_INTERVALS_TABLE_NAME}' (
+                    id INTEGER PRIMARY KEY,
+                    session_id INTEGER NOT NULL REFERENCES '{DB_TABLE_NAME}' (id),
+                    start REAL NOT NULL,
+                    stop REAL NOT NULL,
+                    start_mono REAL NOT NULL,
+                    stop_mono REAL NOT NULL);
+            """
+        )
+        # Unique so that spans written again after a crash are ignored
+        connection.execute(
+            f"""CREATE UNIQUE INDEX IF NOT EXISTS idx_{DB_INTERVALS_TABLE_NAME}_session
+                ON '{DB_INTERVALS_TABLE_NAME}' (session_id, start)"""
+        )
+        connection.execute(
+            f"""CREATE INDEX IF NOT EXISTS idx_{DB_INTERVALS_TABLE_NAME}_start
+                ON '{DB_INTERVALS_TABLE_NAME}' (start)"""
+        )
+
+    def rebuild_rollup(self, connection):
+        """
+        Recompute the rollup table from the sessions table
+        """
+        connection.execute(f"DELETE FROM '{DB_ROLLUP_TABLE_NAME}'")
+        connection.execute(
+            f"""INSERT INTO '{DB_ROLLUP_TABLE_NAME}' (date, tag, seconds, count)
+                SELECT date, IFNULL(tag, ''), SUM(duration), COUNT(*)
+                FROM '{DB_TABLE_NAME}'
+                WHERE duration IS NOT NULL
+                GROUP BY date, IFNULL(tag, '');
+            """
+        )
+
+    def migrate_to_v2(self, connection):
+        """
+        Add the per day and tag rollup table
+        """
+        self.create_rollup(connection)
+        self.rebuild_rollup(connection)
+
+    def migrate_to_v3(self, connection):
+        """
+        Index sessions by start and tag, used to skip duplicates on import
+        """
+        self.create_indexes(connection)
+
+    def migrate_to_v4(self, connection):
+        """
+        Add the table of data version counters
+        """
+        self.create_meta(connection)
+
+    def migrate_to_v5(self, connection):
+        """
+        Add the table of the running spans of the sessions
+        """
+        self.create_intervals(connection)
+
+    def migrate_to_v6(self, connection):
+        """
+        Add the database id to the table of data version counters
+        """
+        self.create_meta(connection)
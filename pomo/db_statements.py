@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+
+# Filename: db_statements.py
+# Created on: October 18, 2026
+# Author: Lucas Araújo <araujolucas@dcc.ufmg.br>
+
+from .config import (
+    DB_TABLE_NAME,
+    DB_ROLLUP_TABLE_NAME,
+    DB_META_TABLE_NAME,
+    DB_INTERVALS_TABLE_NAME,
+)
+
+
+class SQL:
+    """
+    Statements used by DBManager
+
+    Every value is passed as a bound parameter, so the text of each statement
+    never changes and sqlite3 reuses its compiled plan from the statement cache
+    """
+
+    INSERT_SESSION = f"""INSERT INTO '{DB_TABLE_NAME}' (date, start, start_ts, duration, tag)
+                         VALUES (?, ?, ?, NULL, ?)"""
+
+    INSERT_INTERVAL = f"""INSERT OR IGNORE INTO '{DB_INTERVALS_TABLE_NAME}'
+                          (session_id, start, stop, start_mono, stop_mono)
+                          VALUES (?, ?, ?, ?, ?)"""
+
+    # Time a session was running, from its spans
+    SESSION_ACTIVE_TIME = f"""SELECT SUM(stop_mono - start_mono)
+                              FROM '{DB_INTERVALS_TABLE_NAME}'
+                              WHERE session_id = ?"""
+
+    # Spans started in an epoch range [start, end), with the tag of their session
+    INTERVALS_RANGE = f"""SELECT i.session_id, i.start, i.stop_mono - i.start_mono, s.tag
+                          FROM '{DB_INTERVALS_TABLE_NAME}' AS i
+                          JOIN '{DB_TABLE_NAME}' AS s ON s.id = i.session_id
+                          WHERE i.start >= ? AND i.start < ?
+                          ORDER BY i.start"""
+
+    # Insert a finished (or open) session unless one with the same start and
+    # tag exists. Takes the five values followed by start_ts and tag again
+    IMPORT_SESSION = f"""INSERT INTO '{DB_TABLE_NAME}' (date, start, start_ts, duration, tag)
+                         SELECT ?, ?, ?, ?, ?
+                         WHERE NOT EXISTS (
+                             SELECT 1 FROM '{DB_TABLE_NAME}'
+                             WHERE start_ts = ? AND tag IS ?)"""
+
+    # The unfinished session started at a given time
+    SESSION_AT = f"""SELECT id, duration FROM '{DB_TABLE_NAME}'
+                     WHERE start_ts = ?
+                     ORDER BY id DESC LIMIT 1"""
+
+    FINISH_SESSION = f"UPDATE '{DB_TABLE_NAME}' SET duration = ? WHERE id = ?"
+
+    UPDATE_TAG = f"UPDATE '{DB_TABLE_NAME}' SET tag = ? WHERE id = ?"
+
+    # Sessions in chronological order, streamed by the exports. The date
+    # range is served by the date index, whose entries are already sorted
+    # by date and id, so no sort is needed
+    SESSIONS_RANGE = f"""SELECT id, date, start, start_ts, duration, tag
+                         FROM '{DB_TABLE_NAME}'
+                         WHERE date BETWEEN ? AND ?
+                         ORDER BY date"""
+
+    SESSIONS_ALL = f"""SELECT id, date, start, start_ts, duration, tag
+                       FROM '{DB_TABLE_NAME}'
+                       ORDER BY id"""
+
+    SESSION_COLUMNS = ("id", "date", "start", "start_ts", "duration", "tag")
+
+    SELECT_SESSION = f"SELECT date, tag, duration FROM '{DB_TABLE_NAME}' WHERE id = ?"
+
+    # Add seconds and sessions to a day and tag of the rollup table
+    ADD_TO_ROLLUP = f"""INSERT INTO '{DB_ROLLUP_TABLE_NAME}' (date, tag, seconds, count)
+                        VALUES (?, IFNULL(?, ''), ?, ?)
+                        ON CONFLICT (date, tag) DO UPDATE
+                        SET seconds = seconds + excluded.seconds,
+                            count = count + excluded.count"""
+
+    # Recompute the rollup of one day
+    DELETE_ROLLUP_DAY = f"DELETE FROM '{DB_ROLLUP_TABLE_NAME}' WHERE date = ?"
+
+    ROLLUP_DAY = f"""INSERT INTO '{DB_ROLLUP_TABLE_NAME}' (date, tag, seconds, count)
+                     SELECT date, IFNULL(tag, ''), SUM(duration), COUNT(*)
+                     FROM '{DB_TABLE_NAME}'
+                     WHERE date = ? AND duration IS NOT NULL
+                     GROUP BY IFNULL(tag, '')"""
+
+    # Totals of every day and tag in a date range, scanned by Analytics
+    ROLLUP_RANGE = f"""SELECT date, tag, seconds, count
+                       FROM '{DB_ROLLUP_TABLE_NAME}'
+                       WHERE date BETWEEN ? AND ?"""
+
+    # Range queries, indexed by the group_by argument of DBManager.query_range.
+    # They read the rollup table, so their cost depends on the number of
+    # days and tags in the range, not on the number of sessions
+    RANGE = {
+        None: f"""SELECT SUM(seconds)
+                  FROM '{DB_ROLLUP_TABLE_NAME}'
+                  WHERE date BETWEEN ? AND ?""",
+        "date": f"""SELECT date, SUM(seconds) AS total_duration
+                    FROM '{DB_ROLLUP_TABLE_NAME}'
+                    WHERE date BETWEEN ? AND ?
+                    GROUP BY date
+                    ORDER BY date""",
+        "tag": f"""SELECT tag, SUM(seconds) AS total_duration
+                   FROM '{DB_ROLLUP_TABLE_NAME}'
+                   WHERE date BETWEEN ? AND ?
+                   GROUP BY tag
+                   ORDER BY tag""",
+    }
+
+    # Counters bumped on every write, read by the analytics cache
+    BUMP_VERSION = f"UPDATE '{DB_META_TABLE_NAME}' SET value = value + 1 WHERE key = ?"
+
+    VERSIONS = f"""SELECT
+                       (SELECT value FROM '{DB_META_TABLE_NAME}' WHERE key = 'database_id'),
+                       (SELECT value FROM '{DB_META_TABLE_NAME}' WHERE key = 'history_version'),
+                       (SELECT value FROM '{DB_META_TABLE_NAME}' WHERE key = 'data_version'),
+                       (SELECT MAX(date) FROM '{DB_ROLLUP_TABLE_NAME}')"""
@@ -0,0 +1,429 @@
+#!/usr/bin/env python3
+
+# Filename: db_writer.py
+# Created on: October 18, 2026
+# Author: Lucas Araújo <araujolucas@dcc.ufmg.br>
+
+import time
+import queue
+import sqlite3
+import threading
+
+from .utils import run_worker
+from .log_manager import LogManager
+from .config import (
+    DB_WRITER_QUEUE_SIZE,
+    DB_WRITER_RETRIES,
+    DB_WRITER_RETRY_DELAY,
+    DB_WRITER_FLUSH_TIMEOUT,
+)
+
+
+class DBWriter:
+    """
+    Write-behind front of DBManager for the daemon
+
+    Writes are queued and applied by a dedicated thread, so a slow disk or
+    a database locked by another process never stalls the event loop. The
+    thread takes every write waiting in the queue and applies them in a
+    single transaction, merging consecutive tag changes and span batches.
+    Which session is open is tracked here, so the loop knows it right away
+
+    Every write stays in pending, which the daemon keeps in its journal,
+    until on_commit(seq) reports that the writes up to seq are committed.
+    A busy database is retried until it is free, so writes are committed in
+    order or not at all: on close, the writes not committed in time stay
+    pending, to be replayed by the next instance
+
+    Submitting never blocks: while the queue is full, writes wait in
+    unqueued and are moved to the queue on the next submit or commit
+    """
+
+    # Marks the end of the queue
+    STOP = None
+
+    def __init__(self, db_manager, max_queue=DB_WRITER_QUEUE_SIZE, on_commit=None):
+        self.db_manager = db_manager
+        self.queue = queue.Queue(max_queue)
+        self.log_manager = LogManager()
+        self.thread = None
+        # Start of the session created and not finished yet, if any
+        self.session_start_ts = None
+        # (seq, session, method, args) of the writes not committed yet
+        self.pending = []
+        self.seq = 0
+        # (seq, method, args) of the writes that did not fit in the queue
+        self.unqueued = []
+        self.full = False
+        # Called from the writer thread, confirms right away by default
+        self.on_commit = on_commit or self.confirm
+        # Set on close, to give up on a database that stays busy
+        self.closing = False
+        self.abandoned = False
+
+        self.lock = threading.Lock()
+        self.batches = 0
+        self.operations = 0
+        self.coalesced = 0
+        self.failed = 0
+        self.errors = 0
+        self.overflows = 0
+        self.last_flush = 0.0
+        self.max_flush = 0.0
+        self.total_flush = 0.0
+
+    @property
+    def pending_db_update(self):
+        """
+        Whether a session was created and not finished yet
+        """
+        return self.session_start_ts is not None
+
+    def start(self):
+        """
+        Start the writer thread
+        """
+        self.closing = False
+        self.abandoned = False
+        self.thread = threading.Thread(target=self.run, name="db-writer", daemon=True)
+        self.thread.start()
+
+    def close(self, timeout=DB_WRITER_FLUSH_TIMEOUT):
+        """
+        Apply every queued write and stop the writer thread, waiting at most
+        timeout seconds
+
+        Returns:
+            bool: False if the writes were not applied in time
+        """
+        if self.thread is None:
+            return True
+
+        self.closing = True
+        deadline = time.monotonic() + timeout
+
+        # Waiting for room in the queue and for the thread share the timeout
+        with self.lock:
+            writes, self.unqueued = self.unqueued, []
+
+        writes.append(self.STOP)
+
+        try:
+            while writes:
+                self.queue.put(writes[0], timeout=max(deadline - time.monotonic(), 0))
+                writes.pop(0)
+
+        except queue.Full:
+            self.log_manager.log("Database writer queue is full, can not stop it", level="ERROR")
+
+            # Still pending, and kept in the journal
+            with self.lock:
+                self.unqueued = writes[:-1]
+
+        self.thread.join(max(deadline - time.monotonic(), 0))
+
+        if self.thread.is_alive():
+            self.log_manager.log(
+                f"Database writer did not stop in {timeout}s, "
+                f"{self.queue.qsize()} writes left",
+                level="ERROR",
+            )
+            return False
+
+        self.thread = None
+        self.log_manager.log(f"Closed database writer: {self.get_metrics()}", level="INFO")
+
+        return True
+
+    def flush(self, timeout=DB_WRITER_FLUSH_TIMEOUT):
+        """
+        Wait until every queued write was applied, at most timeout seconds
+
+        Returns:
+            bool: False if some writes were still queued after the timeout
+        """
+        if self.thread is None:
+            return True
+
+        deadline = time.monotonic() + timeout
+
+        while True:
+            # The queue was drained, the writes waiting for room can go in
+            self.push()
+
+            with self.queue.all_tasks_done:
+                if not self.queue.unfinished_tasks and not self.unqueued:
+                    return True
+
+                remaining = deadline - time.monotonic()
+
+                if remaining <= 0:
+                    return False
+
+                self.queue.all_tasks_done.wait(remaining)
+
+    def submit(self, method, *args, session=None):
+        """
+        Queue a call to a DBManager method on the given session, keeping it
+        pending until committed
+        """
+        self.seq += 1
+
+        with self.lock:
+            self.pending.append((self.seq, session, method, args))
+            self.unqueued.append((self.seq, method, args))
+
+        self.push()
+
+        with self.lock:
+            # Writes are queued in order, so it is the last one left
+            if self.unqueued:
+                self.overflows += 1
+
+    def push(self):
+        """
+        Move the unqueued writes to the queue, in order, as long as it has
+        room. The writes left over stay pending, so they are kept in the
+        journal as well
+        """
+        with self.lock:
+            while self.unqueued:
+                try:
+                    self.queue.put_nowait(self.unqueued[0])
+
+                except queue.Full:
+                    if not self.full:
+                        self.full = True
+                        self.log_manager.log(
+                            "Database writer queue is full, keeping writes until it has room",
+                            level="WARN",
+                        )
+                    return
+
+                self.unqueued.pop(0)
+
+            self.full = False
+
+    def confirm(self, seq):
+        """
+        Forget the pending writes up to seq, which are committed
+        """
+        with self.lock:
+            self.pending = [write for write in self.pending if write[0] > seq]
+
+        self.push()
+
+    def get_pending(self):
+        """
+        Get the [session, method, args] writes not committed yet, as kept in
+        the journal
+        """
+        with self.lock:
+            return [[session, method, list(args)] for _, session, method, args in self.pending]
+
+    def replay(self, pending, tag):
+        """
+        Queue again the writes left pending by a previous instance. Every
+        write is applied on the session it was made on, which is resumed
+        (or created, when its creation was pending too) first. Resuming a
+        finished session leaves no session open, so replaying writes that
+        were committed after all changes nothing
+        """
+        current = None
+
+        for session, method, args in pending:
+            if method == "create_session":
+                method, args = "resume_session", [args[1], args[0]]
+
+            if method == "resume_session":
+                current = session
+
+            elif session != current:
+                self.submit("resume_session", session, tag, session=session)
+                current = session
+
+            self.submit(method, *args, session=session)
+
+        if pending:
+            self.log_manager.log(f"Replaying {len(pending)} pending writes", level="INFO")
+
+    def resume_session(self, start_ts, tag):
+        """
+        Take over the session started at start_ts
+        """
+        self.session_start_ts = start_ts
+        self.submit("resume_session", start_ts, tag, session=start_ts)
+
+    def create_session(self, tag):
+        """
+        Create a session starting now
+        """
+        if self.pending_db_update:
+            return
+
+        self.session_start_ts = int(time.time())
+        self.submit("create_session", tag, self.session_start_ts, session=self.session_start_ts)
+
+    def finish_session(self, duration, intervals=()):
+        """
+        Finish the open session
+        """
+        if not self.pending_db_update:
+            return
+
+        session, self.session_start_ts = self.session_start_ts, None
+        self.submit("finish_session", duration, list(intervals), session=session)
+
+    def update_tag(self, tag):
+        """
+        Change the tag of the open session
+        """
+        if self.pending_db_update:
+            self.submit("update_tag", tag, session=self.session_start_ts)
+
+    def add_intervals(self, intervals):
+        """
+        Write spans of the open session
+        """
+        if self.pending_db_update and intervals:
+            self.submit("add_intervals", list(intervals), session=self.session_start_ts)
+
+    def coalesce(self, operations):
+        """
+        Merge consecutive writes with the same effect: only the last of
+        consecutive tag changes matters, and consecutive span batches are
+        written as one
+        """
+        merged = []
+
+        for method, args in operations:
+            if merged and merged[-1][0] == method == "update_tag":
+                merged[-1] = (method, args)
+
+            elif merged and merged[-1][0] == method == "add_intervals":
+                merged[-1] = (method, (merged[-1][1][0] + args[0],))
+
+            else:
+                merged.append((method, args))
+                continue
+
+            self.coalesced += 1
+
+        return merged
+
+    def run(self):
+        """
+        Apply the queued writes until the queue is closed. The thread never
+        dies on an error, or flush() would wait forever
+        """
+        run_worker(self.queue, self.write, self.drop, self.STOP)
+
+    def write(self, batch):
+        """
+        Apply a batch of (seq, method, args) writes in a single transaction,
+        retrying while the database is busy
+        """
+        # Once a batch is abandoned, the later ones must not be committed
+        # before it, they stay pending as well
+        if self.abandoned:
+            return
+
+        db_manager = self.db_manager
+        operations = self.coalesce([(method, args) for _, method, args in batch])
+        attempt = 0
+
+        while True:
+            attempt += 1
+            # Restored if the transaction is rolled back
+            session = (db_manager.session_id, db_manager.session_start_ts)
+            start = time.perf_counter()
+
+            try:
+                with db_manager.transaction():
+                    for method, args in operations:
+                        getattr(db_manager, method)(*args)
+
+            except sqlite3.Error as e:
+                db_manager.session_id, db_manager.session_start_ts = session
+
+                if attempt == 1:
+                    self.log_manager.log(
+                        f"Failed to write {len(operations)} operations, retrying: {e}",
+                        level="WARN",
+                    )
+
+                if attempt % DB_WRITER_RETRIES == 0:
+                    with self.lock:
+                        self.failed += 1
+
+                    self.log_manager.log(
+                        f"Failed to write {len(operations)} operations "
+                        f"after {attempt} attempts: {e}",
+                        level="ERROR",
+                    )
+
+                    if self.closing:
+                        self.abandoned = True
+                        self.log_manager.log(
+                            f"Left {len(batch)} writes pending for the next instance",
+                            level="ERROR",
+                        )
+                        return
+
+                time.sleep(DB_WRITER_RETRY_DELAY)
+                continue
+
+            except Exception as e:
+                # Not a busy database, retrying would fail the same way
+                db_manager.session_id, db_manager.session_start_ts = session
+                self.drop(batch, e)
+                return
+
+            elapsed = time.perf_counter() - start
+
+            with self.lock:
+                self.batches += 1
+                self.operations += len(operations)
+                self.last_flush = elapsed
+                self.max_flush = max(self.max_flush, elapsed)
+                self.total_flush += elapsed
+
+            self.on_commit(batch[-1][0])
+
+            return
+
+    def drop(self, batch, error):
+        """
+        Give up on a batch of writes that can not succeed, counting it in the
+        metrics. They are not kept pending, a replay would fail the same way
+        """
+        with self.lock:
+            self.errors += 1
+
+        self.log_manager.log(
+            f"Dropped {len(batch)} operations: {batch} ({type(error).__name__}: {error})",
+            level="ERROR",
+        )
+        self.on_commit(batch[-1][0])
+
+    def get_metrics(self):
+        """
+        Get the queue depth and the flush latencies, in milliseconds
+        """
+        with self.lock:
+            return {
+                "queue_depth": self.queue.qsize(),
+                "pending": len(self.pending),
+                "unqueued": len(self.unqueued),
+                "batches": self.batches,
+                "operations": self.operations,
+                "coalesced": self.coalesced,
+                "failed": self.failed,
+                "errors": self.errors,
+                "overflows": self.overflows,
+                "last_flush_ms": round(self.last_flush * 1000, 3),
+                "max_flush_ms": round(self.max_flush * 1000, 3),
+                "mean_flush_ms": round(
+                    self.total_flush * 1000 / self.batches if self.batches else 0.0, 3
+                ),
+            }
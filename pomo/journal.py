@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+
+# Filename: journal.py
+# Created on: October 18, 2026
+# Author: Lucas Araújo <araujolucas@dcc.ufmg.br>
+
+import os
+import json
+import time
+import queue
+import threading
+
+from .utils import run_worker
+from .log_manager import LogManager
+from .config import (
+    JOURNAL_SUFFIX,
+    JOURNAL_CHECKPOINT_INTERVAL,
+    JOURNAL_COMPACT_RECORDS,
+    JOURNAL_CLOSE_TIMEOUT,
+)
+
+
+class Journal:
+    """
+    Append-only journal of the timer state, one JSON record per line
+
+    A checkpoint record holds the whole state and an event record only the
+    fields an action changed, so replaying is applying the events on top of
+    the last checkpoint. Every record is flushed to disk, and a torn last
+    line left by a crash is ignored on replay
+
+    Once started, records are written and fsynced by a dedicated thread, so
+    a slow disk never stalls the event loop. The records waiting together
+    in its queue are fsynced once
+    """
+
+    # Marks the end of the queue
+    STOP = None
+
+    def __init__(self, database):
+        self.path = os.path.expanduser(database) + JOURNAL_SUFFIX
+        self.log_manager = LogManager()
+        self.state = {}
+        self.records = 0
+        self.last_checkpoint = 0
+        self.file = None
+        self.queue = queue.Queue()
+        self.thread = None
+
+    def ensure_dir(self):
+        """
+        Ensure the directory of the journal exists
+        """
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+
+    def open(self):
+        """
+        Open the journal file for appending
+        """
+        if self.file is None:
+            self.ensure_dir()
+            self.file = open(self.path, "a")
+
+        return self.file
+
+    def start(self):
+        """
+        Start the writer thread
+        """
+        self.thread = threading.Thread(target=self.run, name="journal", daemon=True)
+        self.thread.start()
+
+    def close(self, timeout=JOURNAL_CLOSE_TIMEOUT):
+        """
+        Write every queued record, stop the writer thread and close the
+        journal file, waiting at most timeout seconds
+
+        Returns:
+            bool: False if the records were not written in time
+        """
+        if self.thread is not None:
+            self.queue.put(self.STOP)
+            self.thread.join(timeout)
+
+            if self.thread.is_alive():
+                self.log_manager.log(
+                    f"Journal writer did not stop in {timeout}s", level="ERROR"
+                )
+                return False
+
+            self.thread = None
+
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+        return True
+
+    def submit(self, kind, record):
+        """
+        Queue a record to be appended, or to replace the whole journal when
+        kind is "compact". Written right away if the thread is not running
+        """
+        line = json.dumps(record, separators=(",", ":")) + "\n"
+
+        if self.thread is None:
+            self.write([(kind, line)])
+        else:
+            self.queue.put((kind, line))
+
+    def run(self):
+        """
+        Write the queued records until the queue is closed
+        """
+        run_worker(self.queue, self.write, self.write_failed, self.STOP)
+
+    def write(self, items):
+        """
+        Write (kind, line) records, and flush them to disk
+        """
+        pending = False
+
+        for kind, line in items:
+            if kind == "compact":
+                self.replace(line)
+                pending = False
+
+            else:
+                self.open().write(line)
+                pending = True
+
+        if pending:
+            self.file.flush()
+            os.fsync(self.file.fileno())
+
+    def write_failed(self, items, error):
+        """
+        Log records that could not be written
+        """
+        self.log_manager.log(
+            f"Failed to write {len(items)} journal records: {error}", level="ERROR"
+        )
+
+    def replace(self, line):
+        """
+        Atomically replace the journal file by a single line
+        """
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+        self.ensure_dir()
+        tmp = self.path + ".tmp"
+
+        with open(tmp, "w") as f:
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+
+        os.replace(tmp, self.path)
+
+    def append(self, record):
+        """
+        Append a record
+        """
+        self.submit("append", record)
+        self.records += 1
+
+    def replay(self):
+        """
+        Rebuild the last state recorded in the journal
+
+        Returns:
+            tuple: (state, wall time of the last record), or (None, None)
+                   when there is no journal
+        """
+        state = None
+        wall = None
+        records = 0
+
+        try:
+            with open(self.path) as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+
+                    except ValueError:
+                        self.log_manager.log("Skipping torn journal record", level="WARN")
+                        continue
+
+                    if record.get("type") == "checkpoint":
+                        state = dict(record["state"])
+
+                    elif state is not None:
+                        state.update(record["changes"])
+
+                    wall = record["wall"]
+                    records += 1
+
+        except FileNotFoundError:
+            return None, None
+
+        self.state = dict(state or {})
+        self.records = records
+
+        return state, wall
+
+    def record(self, event, state):
+        """
+        Record the fields of the state changed by an event
+        """
+        changes = {key: value for key, value in state.items() if self.state.get(key) != value}
+
+        if not changes:
+            return
+
+        self.append({"type": "event", "event": event, "wall": time.time(), "changes": changes})
+        self.state = dict(state)
+
+        if self.records >= JOURNAL_COMPACT_RECORDS:
+            self.compact(state)
+
+    def checkpoint(self, state):
+        """
+        Record the whole state
+        """
+        self.append({"type": "checkpoint", "wall": time.time(), "state": state})
+        self.state = dict(state)
+        self.last_checkpoint = time.monotonic()
+
+    def checkpoint_due(self):
+        """
+        Check if a running timer should be checkpointed
+        """
+        return time.monotonic() - self.last_checkpoint >= JOURNAL_CHECKPOINT_INTERVAL
+
+    def compact(self, state):
+        """
+        Replace the journal by a single checkpoint of the state
+        """
+        self.submit("compact", {"type": "checkpoint", "wall": time.time(), "state": state})
+        self.state = dict(state)
+        self.records = 1
+        self.last_checkpoint = time.monotonic()
+        self.log_manager.log("Compacted the journal", level="DEBUG")
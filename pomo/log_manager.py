@@ -4,50 +4,114 @@
 # Created on: March  2, 2024
 # Author: Lucas Araújo <araujolucas@dcc.ufmg.br>
 
-import datetime
-import inspect
-import re
+import sys
+import logging
+from logging.handlers import MemoryHandler, RotatingFileHandler, WatchedFileHandler
+
+from .config import (
+    LOGFILE,
+    LOG_LEVEL,
+    LOG_MAX_BYTES,
+    LOG_BACKUP_COUNT,
+    LOG_BUFFER_RECORDS,
+)
+
+LEVELS = {
+    "DEBUG": logging.DEBUG,
+    "INFO": logging.INFO,
+    "WARN": logging.WARNING,
+    "WARNING": logging.WARNING,
+    "ERROR": logging.ERROR,
+}
+
+
+class Formatter(logging.Formatter):
+    """
+    Formatter keeping the level names used by the log file so far, without
+    renaming the levels of every other logger of the process
+    """
+
+    LEVEL_NAMES = {"WARNING": "WARN"}
+
+    def format(self, record):
+        if record.levelname in self.LEVEL_NAMES:
+            record = logging.makeLogRecord(record.__dict__)
+            record.levelname = self.LEVEL_NAMES[record.levelname]
 
-from .config import LOGFILE
+        return super().format(record)
 
 
 class LogManager:
     """
     Log manager class
+
+    Every instance writes through the same 'pomo' logger, set up on first
+    use: the log file is opened once and records are buffered and written
+    in batches (right away for warnings and errors)
+
+    The daemon, the CLI and the GUI all write to the same file, so only the
+    process that sets the logger up with rotate (the daemon) rotates it
+    when it grows past LOG_MAX_BYTES. The others reopen it once rotated
     """
 
-    def __init__(self):
-        pass
+    logger = None
+
+    def __init__(self, rotate=False):
+        if LogManager.logger is None:
+            LogManager.logger = self.setup_logger(rotate)
 
     def __del__(self):
         pass
 
+    def setup_logger(self, rotate=False):
+        """
+        Create the shared logger
+        """
+        if rotate:
+            file_handler = RotatingFileHandler(
+                LOGFILE, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT, delay=True
+            )
+        else:
+            file_handler = WatchedFileHandler(LOGFILE, delay=True)
+
+        file_handler.setFormatter(
+            Formatter(
+                "[%(asctime)s] [%(levelname)s] %(caller)s : %(message)s",
+                datefmt="%a %Y-%m-%d %H:%M:%S",
+            )
+        )
+
+        # The buffer is also flushed by logging's exit handler
+        handler = MemoryHandler(
+            LOG_BUFFER_RECORDS, flushLevel=logging.WARNING, target=file_handler
+        )
+
+        logger = logging.getLogger("pomo")
+        logger.setLevel(LEVELS.get(LOG_LEVEL, logging.INFO))
+        logger.addHandler(handler)
+        logger.propagate = False
+
+        return logger
+
     def sanitize_message(self, text):
         """
         Sanitize the message
         """
-
-        text = text.replace("\n", " ")  # Remove newlines
-        text = re.sub(r"\s+", " ", text)  # Remove multiple spaces
-
-        return text
+        # Remove newlines and multiple spaces
+        return " ".join(text.split())
 
     def log(self, text, level="INFO"):
         """
         Register a message in the log file
         """
+        levelno = LEVELS.get(level, logging.INFO)
 
-        text = self.sanitize_message(text)
-
-        timestamp = datetime.datetime.now().strftime("%a %Y-%m-%d %H:%M:%S")
-
-        # Get the calling function's name
-        caller = inspect.stack()[1]
-        caller_function_name = caller.function
-        caller_class_name = caller.frame.f_locals.get("self", None).__class__.__name__
+        # Filter before doing any formatting work
+        if not self.logger.isEnabledFor(levelno):
+            return
 
-        # Format the log message with aligned columns
-        message = f"[{timestamp}] [{level}] {caller_class_name}::{caller_function_name} : {text}"
+        # Get the calling function's name, e.g. Class::method
+        code = sys._getframe(1).f_code
+        caller = getattr(code, "co_qualname", code.co_name).replace(".", "::")
 
-        with open(LOGFILE, "a") as f:
-            f.write(message + "\n")
+        self.logger.log(levelno, self.sanitize_message(text), extra={"caller": caller})
@@ -5,23 +5,30 @@
 # Author: Lucas Araújo <araujolucas@dcc.ufmg.br>
 
 import os
-import socket
 import time
-import select
-import threading
+import signal
+import socket
+import asyncio
 
+from functools import partial
 from contextlib import contextmanager
 
 from .config import (
     SOCKFILE,
-    PACKET_SIZE,
+    DATAGRAM_SIZE,
+    JOURNAL_RESUME_GAP,
+    INTERVALS_BATCH_SIZE,
 )
 
 from .utils import Exit
 from .log_manager import LogManager
 from .status import Status
 from .db_manager import DBManager
+from .db_writer import DBWriter
+from .journal import Journal
 from .server import Server
+from .commands import Commands
+from .protocol import encode_message, decode_request
 
 
 class Pomodoro:
@@ -31,10 +38,114 @@ class Pomodoro:
 
     def __init__(self, args):
         self.status = Status(args.worktime, args.breaktime, args.tag)
-        self.pending_db_update = False
         self.args = args
         self.log_manager = LogManager()
         self.db_manager = DBManager(args.database)
+        # Every write goes through the writer thread, off the event loop
+        self.db_writer = DBWriter(self.db_manager)
+        self.journal = Journal(args.database)
+        # Compact the journal once the finished session is committed
+        self.compact_due = False
+
+    def get_state(self):
+        """
+        Get the state of the timer, the open session and the database writes
+        not committed yet, as kept in the journal
+        """
+        state = self.status.get_state()
+        state["session"] = self.db_writer.session_start_ts
+        state["pending"] = self.db_writer.get_pending()
+
+        return state
+
+    def recover(self):
+        """
+        Resume the timer and the open session of the previous instance from
+        the journal. A timer that was running keeps running, counting the
+        downtime, only if the daemon was down for a short time
+        """
+        state, wall = self.journal.replay()
+
+        if state:
+            self.restore(state, time.time() - wall)
+
+        # Start the journal over from the current state
+        self.journal.compact(self.get_state())
+
+    def restore(self, state, gap):
+        """
+        Restore a state recorded gap seconds ago
+        """
+        resume = state["active"] and 0 <= gap <= JOURNAL_RESUME_GAP
+
+        if resume:
+            state["timer"]["time"] -= gap
+
+        self.status.set_state(state)
+
+        # Writes of the previous instance that may not have been committed
+        self.db_writer.replay(state.get("pending", []), self.status.tag)
+
+        if state.get("session") is not None:
+            self.db_writer.resume_session(state["session"], self.status.tag)
+
+        # The span that was running goes on when the downtime is counted, and
+        # is closed at the last record otherwise. The monotonic clock of the
+        # previous instance may be gone, so the times are taken from the wall
+        # clock
+        if state.get("span"):
+            start, start_mono = state["span"]
+
+            if resume:
+                self.status.span = (start, self.status.timer.clock() - (time.time() - start))
+
+            else:
+                stop = time.time() - gap
+                self.status.intervals.append(
+                    (start, stop, start_mono, start_mono + stop - start)
+                )
+
+        if resume:
+            self.status.toggle()
+
+        self.log_manager.log(
+            f"Recovered {state['status']} timer with {self.status.timer} left "
+            f"({'running' if resume else 'paused'}) from the journal",
+            level="INFO",
+        )
+
+    def flush_intervals(self, force=False):
+        """
+        Write the finished spans of the session to the database once there
+        are enough of them, or right away if forced
+        """
+        if force or len(self.status.intervals) >= INTERVALS_BATCH_SIZE:
+            self.db_writer.add_intervals(self.status.take_intervals())
+
+    def on_commit(self, loop, seq):
+        """
+        Called from the writer thread when the writes up to seq are
+        committed, to update the journal from the event loop
+        """
+        try:
+            loop.call_soon_threadsafe(self.writes_committed, seq)
+
+        except RuntimeError:
+            # The loop is closed, the final checkpoint keeps them pending
+            pass
+
+    def writes_committed(self, seq):
+        """
+        Drop the committed writes from the journal
+        """
+        self.db_writer.confirm(seq)
+
+        if self.compact_due and not self.db_writer.pending:
+            self.compact_due = False
+            self.journal.compact(self.get_state())
+
+        else:
+            self.journal.record("commit", self.get_state())
 
     @contextmanager
     def setup_listener(self):
@@ -42,7 +153,7 @@ class Pomodoro:
         Setup the listener for the socket
         """
         # If there's an existing socket, tell the other to exit and replace it
-        self.action_exit(None, warn=False)
+        self.exit_running_instance()
 
         # If there is a socket on disk after sending an exit request, delete it
         try:
@@ -52,161 +163,205 @@ class Pomodoro:
 
         s = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
         s.bind(SOCKFILE)
+        inode = os.stat(SOCKFILE).st_ino
 
         try:
             yield s
         finally:
             s.close()
-            # Don't try to delete the socket since at this point it could
-            # be owned by a different process
-            # try:
-            #     os.remove(SOCKFILE)
-            # except FileNotFoundError:
-            #     pass
+            # Delete the socket, which a new instance waits for, unless it
+            # is already owned by a different process
+            try:
+                if os.stat(SOCKFILE).st_ino == inode:
+                    os.remove(SOCKFILE)
+            except FileNotFoundError:
+                pass
 
-    @contextmanager
-    def setup_client(self):
+    def check_actions(self, sock):
         """
-        Setup the client for the socket
+        Handle every message waiting on the socket.
+        Called by the event loop as soon as the socket becomes readable
         """
-        # creates socket object
-        s = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        while True:
+            try:
+                data, address = sock.recvfrom(DATAGRAM_SIZE)
 
-        s.connect(SOCKFILE)
+            except BlockingIOError:
+                break
 
-        try:
-            yield s
-        finally:
-            s.close()
+            except socket.error as e:
+                self.log_manager.log(
+                    f"Lost connection to client. Printing buffer... {e}", level="WARN"
+                )
+                break
 
-    def wait_for_socket_cleanup(self, tries=20, wait=0.5):
-        """
-        Wait for the socket to be removed
-        """
-        for i in range(tries):
-            if not os.path.isfile(SOCKFILE):
-                return True
-            else:
-                time.sleep(wait)
+            if not data:
+                continue
+
+            try:
+                self.handle_message(sock, data, address)
+
+            except Exit:
+                exit_msg = "Received exit request..."
+                print(exit_msg)
+                self.log_manager.log(exit_msg)
+                self.exit_event.set()
+                return
 
-        return False
+        # Let the ticker reschedule and publish the result right away
+        self.wakeup.set()
 
-    def check_actions(self, sock, status):
+    def handle_message(self, sock, data, address):
         """
-        Check for actions on the socket
+        Handle a message: either a single plain text action, or a request
+        with a batch of actions, answered with the result of each one and
+        the resulting status when the sender asks for it
         """
-        timeout = time.time() + 0.9
+        try:
+            request = decode_request(data)
 
-        data = ""
+        except ValueError as e:
+            self.log_manager.log(f"Ignoring malformed message: {e}", level="WARN")
+            return
 
-        while True:
-            ready = select.select([sock], [], [], 0.2)
+        results = []
+        exiting = False
+
+        for action in request["commands"]:
+            self.log_manager.log(f"Received action '{action}'", level="DEBUG")
 
-            if time.time() > timeout:
+            try:
+                result = self.handle_action(action)
+                self.flush_intervals()
+                self.journal.record(action.split(" ", 1)[0], self.get_state())
+                results.append({"command": action, "ok": True, **(result or {})})
+
+            except Exit:
+                results.append({"command": action, "ok": True})
+                exiting = True
                 break
 
-            if ready[0]:
-                try:
-                    data = sock.recv(PACKET_SIZE)
-                    if data:
-                        break
-                except socket.error as e:
-                    self.log_manager.log(
-                        f"Lost connection to client. Printing buffer... {e}", level="WARN"
-                    )
-                    break
+            except Exception as e:
+                self.log_manager.log(f"Failed action '{action}': {e}", level="WARN")
+                results.append({"command": action, "ok": False, "error": str(e)})
 
-        if not data:
-            return
+        if request.get("reply") and address:
+            self.status.update()
+            reply = {
+                "id": request.get("id"),
+                "results": results,
+                "status": self.status.snapshot(),
+            }
+
+            if exiting:
+                # Sent by run() once everything is on disk, which a new
+                # instance waits for
+                self.exit_reply = (reply, address)
 
-        action = data.decode("utf8")
+            else:
+                self.send_reply(sock, reply, address)
+
+        if exiting:
+            raise Exit()
+
+    def send_reply(self, sock, reply, address):
+        """
+        Send the reply to a request
+        """
+        try:
+            sock.sendto(encode_message(reply), address)
+
+        except OSError as e:
+            self.log_manager.log(f"Could not send reply: {e}", level="WARN")
+
+    def handle_action(self, action):
+        """
+        Apply an action to the status
+
+        Returns:
+            dict: Extra fields for the result of the action, if any
+        """
+        status = self.status
 
         if action == "toggle":
-            if self.status.status == "work":
-                self.db_manager.create_session(self.status.tag)
+            if status.status == "work":
+                self.db_writer.create_session(status.tag)
             status.toggle()
 
         elif action == "end":
-            if self.status.status == "work":
-                self.db_manager.finish_session(self.status.timer.get_real_elapsed())
+            finished = status.status == "work"
+
+            if finished:
+                status.stop_span()
+                self.db_writer.finish_session(
+                    status.timer.get_real_elapsed(), status.take_intervals()
+                )
             status.next_timer()
 
+            # Its history is dropped once the session is in the database
+            if finished:
+                self.compact_due = True
+
         elif action == "lock":
             status.toggle_lock()
 
-        elif action.startswith("tag"):
-            _, tag = action.split(" ")
-            self.db_manager.update_tag(tag)
+        elif action.startswith("tag "):
+            _, tag = action.split(" ", 1)
+            tag = status.sanitize_tag(tag)
+            self.db_writer.update_tag(tag)
             status.change_tag(tag)
 
-        elif action.startswith("time"):
+        elif action.startswith("time "):
             _, op, seconds = action.split(" ")
             status.change(op, seconds)
 
+        elif action == "metrics":
+            return {"metrics": self.db_writer.get_metrics()}
+
         elif action == "exit":
             raise Exit()
 
-    def action_toggle(self, args):
-        """
-        Toggle the timer
-        """
-        with self.setup_client() as s:
-            msg = "toggle"
-            s.send(msg.encode("utf8"))
-            self.log_manager.log("Toggled timer")
+        else:
+            raise ValueError(f"Unknown action '{action}'")
 
-    def action_end(self, args):
+    async def tick(self):
         """
-        End the timer
+        Update the timer and publish it each time the displayed second
+        changes. A paused timer does not change, so while paused this sleeps
+        until a command wakes it up
         """
-        with self.setup_client() as s:
-            msg = "end"
-            s.send(msg.encode("utf8"))
-            self.log_manager.log("Ended timer")
+        while True:
+            self.status.update()
+            self.server.publish()
+            self.wakeup.clear()
 
-    def action_lock(self, args):
-        """
-        Lock the timer
-        """
-        with self.setup_client() as s:
-            msg = "lock"
-            s.send(msg.encode("utf8"))
-            self.log_manager.log("Toggled lock")
+            if self.status.active != self.journal.state.get("active"):
+                # Paused by a suspend
+                self.flush_intervals()
+                self.journal.record("update", self.get_state())
 
-    def action_time(self, args):
-        """
-        Change the timer
-        """
-        with self.setup_client() as s:
-            msg = "time " + " ".join(args.delta)
-            s.send(msg.encode("utf8"))
-            self.log_manager.log(f"Changed timer by {args.delta}")
+            elif self.status.active and self.journal.checkpoint_due():
+                self.journal.checkpoint(self.get_state())
 
-    def action_change_tag(self, args):
-        """
-        Change the tag
-        """
-        with self.setup_client() as s:
-            msg = "tag " + args.tag
-            s.send(msg.encode("utf8"))
-            self.log_manager.log(f"Changed tag to {args.tag}")
+            timeout = self.status.timer.time_to_next_event() if self.status.active else None
+
+            try:
+                await asyncio.wait_for(self.wakeup.wait(), timeout)
 
-    def action_exit(self, args, warn=True):
+            except asyncio.TimeoutError:
+                pass
+
+    def exit_running_instance(self):
         """
-        Exit the timer
+        Ask any pomodoro already listening to exit
         """
-        try:
-            with self.setup_client() as s:
-                msg = "exit"
-                s.send(msg.encode("utf8"))
-                self.log_manager.log("Exiting...")
-
-        except (FileNotFoundError, ConnectionRefusedError) as e:
-            if warn:
-                self.log_manager.log(f"No instance of pomodoro listening, error: {e}", level="WARN")
-        else:
-            if not self.wait_for_socket_cleanup():
-                self.log_manager.log("Socket was not removed, assuming it's stale", level="WARN")
+        if not Commands().action_exit(None):
+            # Taking over the socket would leave two daemons writing the
+            # same database and journal
+            error_msg = "The running pomodoro did not exit, not starting"
+            print(error_msg)
+            self.log_manager.log(error_msg, level="ERROR")
+            exit(1)
 
     def action_display(self, args):
         """
@@ -216,32 +371,64 @@ class Pomodoro:
         print(run_msg)
         self.log_manager.log(run_msg)
 
-        # Run server
+        try:
+            asyncio.run(self.run())
+
+        # Ctrl+C
+        except KeyboardInterrupt:
+            keyboard_msg = "Keyboard interrupt received, exiting..."
+            self.log_manager.log(keyboard_msg)
+            print(keyboard_msg)
+
+        self.db_manager.close()
+
+    async def run(self):
+        """
+        Run the daemon: a single event loop owns the command socket, the
+        status server and the timer ticks
+        """
+        loop = asyncio.get_running_loop()
+        self.exit_event = asyncio.Event()
+        self.wakeup = asyncio.Event()
+        self.exit_reply = None
         self.server = Server(self.status)
-        self.server_thread = threading.Thread(target=self.server.run)
-        self.server_thread.start()
 
-        # Listen on socket
         with self.setup_listener() as sock:
+            self.db_writer.on_commit = partial(self.on_commit, loop)
+            self.db_writer.start()
+            self.journal.start()
+
+            # The previous instance saved its state before releasing the socket
+            self.recover()
+
+            sock.setblocking(False)
+            await self.server.start()
+            loop.add_reader(sock, self.check_actions, sock)
+            # The GUI, systemd and kill stop the daemon with SIGTERM, which
+            # must save the state like an exit request
+            loop.add_signal_handler(signal.SIGTERM, self.exit_event.set)
+            ticker = asyncio.create_task(self.tick())
+
             try:
-                while True:
-                    self.status.update()
-                    # self.log_manager.log(f"timer: {self.status.get_timer()}")
-                    # self.status.send_status()
-
-                    try:
-                        self.check_actions(sock, self.status)
-
-                    except Exit:
-                        exit_msg = "Received exit request..."
-                        print(exit_msg)
-                        self.log_manager.log(exit_msg)
-                        break
-
-            # Ctrl+C
-            except KeyboardInterrupt:
-                keyboard_msg = "Keyboard interrupt received, exiting..."
-                self.log_manager.log(keyboard_msg)
-                print(keyboard_msg)
-
-        self.server_thread.join()
+                await self.exit_event.wait()
+
+            finally:
+                loop.remove_reader(sock)
+                loop.remove_signal_handler(signal.SIGTERM)
+                ticker.cancel()
+                await self.server.stop()
+                self.flush_intervals(force=True)
+
+                # Waiting for the writes may take a while with a locked
+                # database, so it is done off the loop and bounded
+                if not await loop.run_in_executor(None, self.db_writer.close):
+                    self.log_manager.log(
+                        "Exiting with database writes pending, the journal keeps the session",
+                        level="ERROR",
+                    )
+
+                self.journal.checkpoint(self.get_state())
+                await loop.run_in_executor(None, self.journal.close)
+
+                if self.exit_reply is not None:
+                    self.send_reply(sock, *self.exit_reply)
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+
+# Filename: protocol.py
+# Created on: October 18, 2026
+# Author: Lucas Araújo <araujolucas@dcc.ufmg.br>
+
+import json
+
+FRAME_DELIMITER = b"\n"
+
+# Modes a status client can ask for with a {"mode": ...} frame. Every client
+# gets a full snapshot when it connects; afterwards "full" clients get a
+# full snapshot on every change, "delta" clients a {"delta": {...}} frame
+# with only the changed fields, and "sync" clients a full snapshot only when
+# something other than the countdown of a running timer changes. Sync
+# clients count down on their own from the deadline of the snapshot
+STREAM_MODES = ("full", "delta", "sync")
+
+# Fields that change every second while a timer runs
+COUNTDOWN_FIELDS = ("timer", "remaining")
+
+
+def encode_frame(data):
+    """
+    Encode a message as one newline-delimited JSON frame.
+    json.dumps escapes newlines inside strings, so the delimiter never
+    appears inside a frame
+    """
+    return json.dumps(data, separators=(",", ":")).encode() + FRAME_DELIMITER
+
+
+class FrameReader:
+    """
+    Incremental decoder for a stream of newline-delimited JSON frames
+    """
+
+    def __init__(self):
+        self.buffer = b""
+
+    def feed(self, data):
+        """
+        Add received bytes to the buffer and decode every complete frame.
+        A trailing partial frame is kept until the rest of it arrives
+
+        Returns:
+            list: The decoded frames, oldest first
+        """
+        self.buffer += data
+
+        if FRAME_DELIMITER not in data:
+            return []
+
+        *lines, self.buffer = self.buffer.split(FRAME_DELIMITER)
+
+        return [json.loads(line) for line in lines if line]
+
+
+def encode_message(data):
+    """
+    Encode a message sent as a single datagram on the command socket
+    """
+    return json.dumps(data, separators=(",", ":")).encode()
+
+
+def decode_message(data):
+    """
+    Decode a datagram of the command socket
+    """
+    return json.loads(data)
+
+
+def decode_request(data):
+    """
+    Decode a request received on the command socket.
+    Plain text datagrams are single actions, as sent by older clients
+
+    Returns:
+        dict: The request, with the list of actions in "commands"
+    """
+    text = data.decode("utf8")
+
+    if not text.startswith("{"):
+        return {"commands": [text]}
+
+    request = decode_message(text)
+
+    if not isinstance(request, dict) or not isinstance(request.get("commands"), list):
+        raise ValueError("Request without a list of commands")
+
+    return request
@@ -4,103 +4,224 @@
 # Created on: March 28, 2024
 # Author: Lucas Araújo <araujolucas@dcc.ufmg.br>
 
-import socket
 import json
+import asyncio
 import os
-import threading
 
-from time import sleep
-from .config import SERVER_SOCKFILE
+from .config import SERVER_SOCKFILE, SERVER_CLIENT_BACKLOG, SERVER_MAX_SKIPPED_FRAMES
 from .log_manager import LogManager
+from .protocol import encode_frame, STREAM_MODES, COUNTDOWN_FIELDS
 
 
 class Server:
     """
-    Server class to handle the server socket
+    Server class to broadcast the status to every connected client
+
+    A single event loop serves all the clients: each published status is
+    serialized once per stream mode and the same bytes are written to every
+    subscriber of that mode. A delta client that missed a frame gets a full
+    snapshot again
     """
 
     def __init__(self, status):
         self.status = status
         self.log_manager = LogManager()
         self.total_clients = 0
+        self.last_client_id = 0
+        self.last_snapshot = None
+        self.server = None
+
+        # client_id -> stream writer, and how many frames each one skipped
+        self.clients = {}
+        self.skipped = {}
+        # client_id -> stream mode, and the delta clients needing a snapshot
+        self.modes = {}
+        self.resync = set()
 
     def __del__(self):
         pass
 
-    def run(self):
-        """
-        Run the server
-        """
-        while True:
-            self.setup_socket()
-
-    def setup_socket(self):
+    async def start(self):
         """
-        Configure the server socket
+        Start accepting clients on the server socket, in the running loop
         """
-
         try:
             os.remove(SERVER_SOCKFILE)
 
         except FileNotFoundError:
             pass
 
-        # Add server socket
-        try:
-            server_socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
-            server_socket.bind(SERVER_SOCKFILE)
-            server_socket.listen()
+        self.server = await asyncio.start_unix_server(
+            self.handle_client, path=SERVER_SOCKFILE
+        )
 
-            # server_socket.settimeout(SOCKET_TIMEOUT)
+    async def stop(self):
+        """
+        Stop accepting clients and disconnect the current ones
+        """
+        self.server.close()
 
-            while True:
-                client_socket, client_addr = server_socket.accept()
-                self.log_manager.log(f"Server socket created", level="DEBUG")
+        for client_id in list(self.clients):
+            self.evict(client_id)
+
+        await self.server.wait_closed()
+
+    def publish(self):
+        """
+        Send the current status to every client, unless it did not change
+        """
+        if not self.clients:
+            return
+
+        snapshot = self.status.snapshot()
+        last = self.last_snapshot or {}
+
+        if snapshot == last:
+            return
+
+        self.last_snapshot = snapshot
+        packets = {}
+
+        # A running countdown is left to the sync clients
+        event = snapshot["deadline"] is None or any(
+            last.get(key) != value
+            for key, value in snapshot.items()
+            if key not in COUNTDOWN_FIELDS
+        )
+
+        for client_id, writer in list(self.clients.items()):
+            mode = self.modes[client_id]
+
+            if client_id in self.resync or mode == "full":
+                kind = "full"
+
+            elif mode == "delta":
+                kind = "delta"
+
+            elif event:
+                kind = "full"
+
+            else:
+                continue
+
+            if kind not in packets:
+                base = last if kind == "delta" else None
+                packets[kind] = self.get_packet(snapshot, base)
+
+            if self.send(client_id, writer, packets[kind]):
+                self.resync.discard(client_id)
+
+    def get_packet(self, snapshot=None, last=None):
+        """
+        Serialize a status, or only the fields changed since last
+        """
+        if snapshot is None:
+            snapshot = self.status.snapshot()
+
+        if last is None:
+            return encode_frame(snapshot)
+
+        return encode_frame(
+            {"delta": {key: value for key, value in snapshot.items() if last.get(key) != value}}
+        )
 
-                self.total_clients += 1
-                thread = threading.Thread(
-                    target=self.handle_client,
-                    args=(client_socket, client_addr, self.total_clients),
+    def send(self, client_id, writer, packet):
+        """
+        Write a packet to a client, skipping it while the client has too much
+        unread data and evicting clients that stay behind
+
+        Returns:
+            bool: True if the packet was written
+        """
+        transport = writer.transport
+
+        if transport.is_closing():
+            self.evict(client_id)
+            return False
+
+        if transport.get_write_buffer_size() > SERVER_CLIENT_BACKLOG:
+            self.skipped[client_id] += 1
+            # Its next frame must be a whole snapshot
+            self.resync.add(client_id)
+
+            if self.skipped[client_id] > SERVER_MAX_SKIPPED_FRAMES:
+                self.log_manager.log(
+                    f"Client {client_id} is not reading, disconnecting it", level="WARN"
                 )
-                thread.start()
+                self.evict(client_id)
 
-        except Exception as e:
-            self.log_manager.log(f"Error: {e}", level="ERROR")
+            return False
 
-        finally:
-            server_socket.close()
+        self.skipped[client_id] = 0
+        writer.write(packet)
 
-    def handle_client(self, client_socket, client_addr, client_id):
+        return True
+
+    def evict(self, client_id):
         """
-        Handle the client socket
+        Forget a client and close its socket
         """
+        writer = self.clients.pop(client_id, None)
+        self.skipped.pop(client_id, None)
+        self.modes.pop(client_id, None)
+        self.resync.discard(client_id)
+
+        if writer is not None:
+            writer.close()
+            self.total_clients -= 1
+
+    async def handle_client(self, reader, writer):
+        """
+        Register a client until it disconnects
+        """
+        self.last_client_id += 1
+        client_id = self.last_client_id
+
+        self.log_manager.log(f"Client {client_id} connected", level="DEBUG")
+        self.clients[client_id] = writer
+        self.skipped[client_id] = 0
+        self.modes[client_id] = "full"
+        self.total_clients += 1
+
+        # Send the current status right away instead of waiting for a change
+        self.send(client_id, writer, self.get_packet())
+
         try:
+            # Clients only send the stream mode they want, if anything, so
+            # this returns on disconnect
             while True:
-                sleep(1)
-                status_data = {
-                    "status": self.status.status,
-                    "timer": self.status.timer.format_time(),
-                    "active": self.status.active,
-                    "remaining": (
-                        self.status.worktime - self.status.timer.get_elapsed()
-                        if self.status.status == "work"
-                        else self.status.breaktime - self.status.timer.get_elapsed()
-                    ),
-                    "tag": self.status.tag,
-                    "total_time": (
-                        self.status.worktime
-                        if self.status.status == "work"
-                        else self.status.breaktime
-                    ),
-                }
-
-                packet = json.dumps(status_data)
-
-                client_socket.send(packet.encode())
-
-        except BrokenPipeError:
-            self.log_manager.log(f"Lost connection to client {client_id}", level="WARN")
-
-        finally:
-            self.total_clients -= 1
-            client_socket.close()
+                line = await reader.readline()
+
+                if not line:
+                    break
+
+                self.handle_request(client_id, line)
+
+        except ConnectionError:
+            pass
+
+        self.log_manager.log(f"Lost connection to client {client_id}", level="WARN")
+        self.evict(client_id)
+
+    def handle_request(self, client_id, line):
+        """
+        Handle a frame sent by a client: {"mode": ...} selects its stream mode
+        """
+        try:
+            mode = json.loads(line)["mode"]
+
+            if mode not in STREAM_MODES:
+                raise ValueError(f"unknown mode {mode!r}")
+
+        except (ValueError, KeyError, TypeError) as e:
+            self.log_manager.log(f"Ignoring request of client {client_id}: {e}", level="WARN")
+            return
+
+        self.modes[client_id] = mode
+
+        # The snapshots it got may differ from the last published one, so
+        # deltas start after the next full snapshot
+        if mode == "delta":
+            self.resync.add(client_id)
+
+        self.log_manager.log(f"Client {client_id} uses the {mode} stream", level="DEBUG")
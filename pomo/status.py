@@ -5,10 +5,12 @@
 # Author: Lucas Araújo <araujolucas@dcc.ufmg.br>
 
 import sys
+import time
 import operator
 import subprocess
 
 from .timer import Timer
+from .suspend import SuspendDetector
 from .config import ICON
 from .log_manager import LogManager
 
@@ -18,7 +20,7 @@ class Status:
     Status class to keep track of the timer and the current status
     """
 
-    def __init__(self, worktime, breaktime, tag):
+    def __init__(self, worktime, breaktime, tag, suspend_detector=None):
         self.worktime = worktime
         self.breaktime = breaktime
         self.status = "work"  # or "break"
@@ -27,6 +29,11 @@ class Status:
         self.timer = Timer(self.worktime, self.tag, self.status)
         self.locked = True
         self.log_manager = LogManager()
+        self.suspend_detector = suspend_detector or SuspendDetector()
+        # (start, start_mono) of the running work timer, and the finished
+        # (start, stop, start_mono, stop_mono) spans not written yet
+        self.span = None
+        self.intervals = []
 
     def __del__(self):
         pass
@@ -38,6 +45,55 @@ class Status:
 
         return f"{self.timer}\n"
 
+    def snapshot(self):
+        """
+        Get the current status as a dict, as sent to the clients
+        """
+        total_time = self.worktime if self.status == "work" else self.breaktime
+
+        return {
+            "status": self.status,
+            "timer": self.timer.format_time(),
+            "active": self.active,
+            "remaining": round(total_time - self.timer.get_elapsed(), 3),
+            "tag": self.tag,
+            "total_time": total_time,
+            # When a running timer reaches zero, on the monotonic clock
+            # (shared by every process of the system), so clients can
+            # count down on their own
+            "deadline": self.timer.deadline if self.active else None,
+        }
+
+    def get_state(self):
+        """
+        Get the state needed to resume the timer, as kept in the journal
+        """
+        if self.active:
+            self.timer.update()
+
+        return {
+            "status": self.status,
+            "tag": self.tag,
+            "active": self.active,
+            "locked": self.locked,
+            "timer": self.timer.get_state(),
+            "span": self.span,
+            "intervals": list(self.intervals),
+        }
+
+    def set_state(self, state):
+        """
+        Restore the state returned by get_state, paused
+        """
+        self.status = state["status"]
+        self.tag = state["tag"]
+        self.locked = state["locked"]
+        self.active = False
+        self.timer = Timer(state["timer"]["total_time"], self.tag, self.status)
+        self.timer.set_state(state["timer"])
+        self.span = None
+        self.intervals = [tuple(interval) for interval in state.get("intervals", [])]
+
     def show(self):
         """
         Show the current status and time
@@ -52,8 +108,49 @@ class Status:
         """
         Toggle the timer
         """
+        if self.active:
+            # Count the time run since the last update before pausing
+            self.timer.update()
+
         self.active = not self.active
 
+        if self.active:
+            # Time does not run while paused, and neither do suspends matter
+            self.timer.tick()
+            self.suspend_detector.reset()
+            self.start_span()
+
+        else:
+            self.stop_span()
+
+    def start_span(self):
+        """
+        Start a span of the work timer running
+        """
+        if self.status == "work" and self.span is None:
+            self.span = (time.time(), self.timer.clock())
+
+    def stop_span(self, stopped_for=0):
+        """
+        Finish the running span, which stopped stopped_for seconds ago
+        """
+        if self.span is None:
+            return
+
+        start, start_mono = self.span
+        self.intervals.append(
+            (start, time.time() - stopped_for, start_mono, self.timer.clock())
+        )
+        self.span = None
+
+    def take_intervals(self):
+        """
+        Take the finished spans, to be written to the database
+        """
+        intervals, self.intervals = self.intervals, []
+
+        return intervals
+
     def toggle_lock(self):
         """
         Toggle the lock
@@ -65,14 +162,20 @@ class Status:
         Update the timer
         """
         if self.active:
+            # The monotonic clock of the timer does not count the time spent
+            # suspended, so it is safe to update before checking
             self.timer.update()
-            if self.is_system_active():
-                self.log_manager.log("System is in suspend. Pausing timer...")
-                self.toggle()
 
-        # This ensures the timer counts time since the last iteration
-        # and not since it was initialized
-        self.timer.tick()
+            gap = self.suspend_detector.poll()
+
+            if gap:
+                self.log_manager.log(
+                    f"System was suspended for {gap:.0f}s. Pausing timer..."
+                )
+                self.active = False
+                # The monotonic clock stopped during the suspend, the wall
+                # clock did not
+                self.stop_span(stopped_for=gap)
 
     def change(self, op, seconds):
         """
@@ -89,6 +192,8 @@ class Status:
         """
         Switch to the next timer
         """
+        self.stop_span()
+
         if self.status == "work":
             if self.active:
                 self.active = False
@@ -135,25 +240,3 @@ class Status:
         Gets only the first word of the tag
         """
         return tag.split(" ")[0]
-
-    def is_system_active(self):
-        """
-        Check if the system is in suspend
-        """
-        try:
-            result = subprocess.run(
-                [
-                    "systemctl",
-                    "is-active",
-                    "sleep.target",
-                    "suspend.target",
-                    "hibernate.target",
-                ],
-                capture_output=True,
-                text=True,
-            ).stdout.split("\n")
-
-            return "active" in result
-
-        except subprocess.CalledProcessError:
-            return False
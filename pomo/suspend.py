@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+
+# Filename: suspend.py
+# Created on: October 18, 2026
+# Author: Lucas Araújo <araujolucas@dcc.ufmg.br>
+
+import time
+import threading
+
+from .log_manager import LogManager
+from .config import SUSPEND_BACKEND, SUSPEND_GAP_THRESHOLD
+
+
+def boottime():
+    """
+    Clock that keeps counting while the system is suspended.
+    Raises OSError where CLOCK_BOOTTIME is not available: the wall clock is
+    no replacement, since an NTP step or a manual change would look like a
+    suspend
+    """
+    try:
+        return time.clock_gettime(time.CLOCK_BOOTTIME)
+    except AttributeError:
+        raise OSError("CLOCK_BOOTTIME is not available")
+
+
+class ClockGapBackend:
+    """
+    Detect suspends by comparing the monotonic clock, which stops while the
+    system sleeps, with a clock that does not. Polling costs two clock reads.
+    Raises OSError if the reference clock is not available
+    """
+
+    def __init__(
+        self, threshold=SUSPEND_GAP_THRESHOLD, monotonic=time.monotonic, reference=boottime
+    ):
+        self.threshold = threshold
+        self.monotonic = monotonic
+        self.reference = reference
+        self.reset()
+
+    def offset(self):
+        """
+        Get the current difference between the reference and monotonic clocks
+        """
+        return self.reference() - self.monotonic()
+
+    def reset(self):
+        """
+        Forget any gap accumulated so far
+        """
+        self.baseline = self.offset()
+
+    def poll(self):
+        """
+        Get the time spent suspended since the last poll, or 0
+        """
+        offset = self.offset()
+        gap = offset - self.baseline
+
+        if gap < self.threshold:
+            return 0
+
+        self.baseline = offset
+        return gap
+
+
+class LogindBackend:
+    """
+    Detect suspends from the PrepareForSleep signal of systemd-logind.
+    Requires the optional jeepney package; the signal is received by a
+    daemon thread, so polling only reads a counter
+    """
+
+    def __init__(self):
+        # Raise ImportError early so the caller can fall back to another backend
+        from jeepney.bus_messages import MatchRule, message_bus
+        from jeepney.io.blocking import open_dbus_connection
+
+        self.log_manager = LogManager()
+        self.lock = threading.Lock()
+        self.gap = 0
+        self.sleep_started = None
+
+        # Only the time between the two signals is measured, so the wall
+        # clock will do where CLOCK_BOOTTIME is not available
+        try:
+            boottime()
+            self.clock = boottime
+        except OSError:
+            self.clock = time.time
+
+        self.connection = open_dbus_connection(bus="SYSTEM")
+        self.rule = MatchRule(
+            type="signal",
+            interface="org.freedesktop.login1.Manager",
+            member="PrepareForSleep",
+            path="/org/freedesktop/login1",
+        )
+        self.connection.send_and_get_reply(message_bus.AddMatch(self.rule))
+
+        self.thread = threading.Thread(target=self.listen, daemon=True)
+        self.thread.start()
+
+    def listen(self):
+        """
+        Receive the PrepareForSleep signals
+        """
+        try:
+            with self.connection.filter(self.rule) as queue:
+                while True:
+                    message = self.connection.recv_until_filtered(queue)
+                    (sleeping,) = message.body
+
+                    with self.lock:
+                        if sleeping:
+                            self.sleep_started = self.clock()
+                        elif self.sleep_started is not None:
+                            self.gap += self.clock() - self.sleep_started
+                            self.sleep_started = None
+
+        except Exception as e:
+            self.log_manager.log(f"Stopped listening to logind: {e}", level="ERROR")
+
+    def reset(self):
+        """
+        Forget any gap accumulated so far
+        """
+        with self.lock:
+            self.gap = 0
+
+    def poll(self):
+        """
+        Get the time spent suspended since the last poll, or 0
+        """
+        with self.lock:
+            gap, self.gap = self.gap, 0
+
+        return gap
+
+
+class FakeBackend:
+    """
+    Backend driven by hand, to simulate suspends in tests
+    """
+
+    def __init__(self):
+        self.gap = 0
+
+    def suspend(self, seconds):
+        """
+        Simulate a suspend of the given length
+        """
+        self.gap += seconds
+
+    def reset(self):
+        """
+        Forget any gap accumulated so far
+        """
+        self.gap = 0
+
+    def poll(self):
+        """
+        Get the time spent suspended since the last poll, or 0
+        """
+        gap, self.gap = self.gap, 0
+        return gap
+
+
+class DisabledBackend:
+    """
+    Backend that never detects a suspend
+    """
+
+    def reset(self):
+        """
+        Forget any gap accumulated so far
+        """
+
+    def poll(self):
+        """
+        Get the time spent suspended since the last poll, always 0
+        """
+        return 0
+
+
+class SuspendDetector:
+    """
+    Tell whether the system was suspended between two polls, using one of
+    the backends above
+    """
+
+    BACKENDS = {
+        "clock": ClockGapBackend,
+        "logind": LogindBackend,
+        "fake": FakeBackend,
+        "off": DisabledBackend,
+    }
+
+    # Tried in order when the selected backend is not available
+    FALLBACKS = ("clock", "logind", "off")
+
+    def __init__(self, backend=SUSPEND_BACKEND):
+        self.log_manager = LogManager()
+
+        if isinstance(backend, str):
+            backend = self.create_backend(backend)
+
+        self.backend = backend
+
+    def create_backend(self, name):
+        """
+        Instantiate a backend by name, falling back to the first available
+        one of FALLBACKS, which ends with detection turned off
+        """
+        if name not in self.BACKENDS:
+            self.log_manager.log(f"Unknown suspend backend {name}", level="WARN")
+
+        for candidate in (name,) + self.FALLBACKS:
+            if candidate not in self.BACKENDS:
+                continue
+
+            try:
+                backend = self.BACKENDS[candidate]()
+
+            except Exception as e:
+                self.log_manager.log(
+                    f"Suspend backend {candidate} unavailable: {e}", level="WARN"
+                )
+                continue
+
+            if candidate != name:
+                self.log_manager.log(f"Using suspend backend {candidate}", level="WARN")
+
+            return backend
+
+    def reset(self):
+        """
+        Start detecting from now, e.g. when the timer is resumed
+        """
+        self.backend.reset()
+
+    def poll(self):
+        """
+        Get the time spent suspended since the last poll, or 0
+        """
+        return self.backend.poll()
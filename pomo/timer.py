@@ -8,11 +8,9 @@ import time
 from subprocess import call, DEVNULL, Popen
 
 from .log_manager import LogManager
+from .utils import format_time, time_to_next_second
 
 from .config import (
-    DAY_FACTOR,
-    HOUR_FACTOR,
-    MINUTE_FACTOR,
     PLAYER,
     ICON,
     SOUND,
@@ -24,10 +22,10 @@ class Timer:
     Timer class to keep track of the time
     """
 
-    def __init__(self, remtime, tag, timer_label):
+    def __init__(self, remtime, tag, timer_label, clock=time.monotonic):
         # Total time defined by the user when creating the timer
         self.total_time = remtime
-        # Time left in the timer
+        # Time left in the timer, as of the last update
         self.time = remtime
         # Total time after modifying the original total time
         self.modified_time = remtime
@@ -36,6 +34,9 @@ class Timer:
         self.sound_played = False
         self.tag = tag
         self.timer_label = timer_label
+        # Monotonic clock: unaffected by wall clock jumps and NTP slews, and
+        # stopped while the system is suspended
+        self.clock = clock
         self.tick()
         self.log_manager = LogManager()
 
@@ -44,49 +45,38 @@ class Timer:
 
     def tick(self):
         """
-        Update the previous time to the current time
+        Set the deadline from the current time left, e.g. when the timer
+        starts running
         """
-        self.previous = time.time()
+        self.deadline = self.clock() + self.time
 
-    def format_time(self):
+    def time_to_next_event(self):
         """
-        Format the time to a string
+        Get the time until something visible happens: the displayed second
+        changes, the warning sound plays or the timer reaches zero
         """
-        if self.time > 0:
-            rem = self.time
-            neg = ""
-        else:
-            rem = -self.time
-            neg = "-"
+        deadlines = [time_to_next_second(self.time)]
 
-        days = int(rem // DAY_FACTOR)
-        rem -= days * DAY_FACTOR
-        hours = int(rem // HOUR_FACTOR)
-        rem -= hours * HOUR_FACTOR
-        minutes = int(rem // MINUTE_FACTOR)
-        rem -= minutes * MINUTE_FACTOR
-        seconds = int(rem // 1)
+        if not self.sound_played and self.time > 4:
+            deadlines.append(self.time - 4)
 
-        strtime = []
-        if days > 0:
-            strtime.append(str(days))
+        if not self.notified_finish and self.time > 0:
+            deadlines.append(self.time)
 
-        if days > 0 or hours > 0:
-            strtime.append("{:02d}".format(hours))
+        return min(deadlines)
 
-        # Always append minutes and seconds
-        strtime.append("{:02d}".format(minutes))
-        strtime.append("{:02d}".format(seconds))
-
-        return neg + ":".join(strtime)
+    def format_time(self):
+        """
+        Format the time to a string
+        """
+        return format_time(self.time)
 
     def update(self):
         """
         Update the timer
         """
-        now = time.time()
-        delta = now - self.previous
-        self.time -= delta
+        # Computed from the deadline, so errors never accumulate
+        self.time = self.deadline - self.clock()
 
         if self.time < 4 and not self.sound_played:
             self.play_sound(SOUND.TIMER)
@@ -145,8 +135,31 @@ class Timer:
         Change the time
         """
         self.time = op(self.time, seconds)
+        self.deadline = op(self.deadline, seconds)
         self.modified_time = op(self.modified_time, seconds)
 
+    def get_state(self):
+        """
+        Get the time and notification flags, as kept in the journal
+        """
+        return {
+            "total_time": self.total_time,
+            "time": self.time,
+            "modified_time": self.modified_time,
+            "sound_played": self.sound_played,
+            "notified_finish": self.notified_finish,
+            "notified_start": self.notified_start,
+        }
+
+    def set_state(self, state):
+        """
+        Restore the state returned by get_state
+        """
+        for key, value in state.items():
+            setattr(self, key, value)
+
+        self.tick()
+
     def get_elapsed(self):
         """
         Get the elapsed time
@@ -4,6 +4,11 @@
 # Created on: March  2, 2024
 # Author: Lucas Araújo <araujolucas@dcc.ufmg.br>
 
+import math
+import queue
+
+from .config import DAY_FACTOR, HOUR_FACTOR, MINUTE_FACTOR
+
 
 class Exit(Exception):
     """
@@ -11,3 +16,79 @@ class Exit(Exception):
     """
 
     pass
+
+
+def format_time(time):
+    """
+    Format a time left, in seconds, as [[D:]HH:]MM:SS, negative past zero
+    """
+    if time > 0:
+        rem = time
+        neg = ""
+    else:
+        rem = -time
+        neg = "-"
+
+    days = int(rem // DAY_FACTOR)
+    rem -= days * DAY_FACTOR
+    hours = int(rem // HOUR_FACTOR)
+    rem -= hours * HOUR_FACTOR
+    minutes = int(rem // MINUTE_FACTOR)
+    rem -= minutes * MINUTE_FACTOR
+    seconds = int(rem // 1)
+
+    strtime = []
+    if days > 0:
+        strtime.append(str(days))
+
+    if days > 0 or hours > 0:
+        strtime.append("{:02d}".format(hours))
+
+    # Always append minutes and seconds
+    strtime.append("{:02d}".format(minutes))
+    strtime.append("{:02d}".format(seconds))
+
+    return neg + ":".join(strtime)
+
+
+def time_to_next_second(time):
+    """
+    Get the time until the formatted time left changes
+    """
+    return time - math.floor(time) or 1
+
+
+def run_worker(work_queue, handle, on_error, stop=None):
+    """
+    Apply handle to the items of a queue in batches, until the stop marker
+    is taken. Each batch is everything waiting in the queue. An error is
+    passed to on_error(batch, error) and never stops the worker, and every
+    item is marked as done, so waiting for the queue never hangs
+    """
+    stopping = False
+
+    while not stopping:
+        batch = [work_queue.get()]
+
+        # Take everything else already waiting
+        while True:
+            try:
+                batch.append(work_queue.get_nowait())
+
+            except queue.Empty:
+                break
+
+        if stop in batch:
+            stopping = True
+            batch = [item for item in batch if item is not stop]
+
+        try:
+            if batch:
+                handle(batch)
+
+        except Exception as e:
+            on_error(batch, e)
+
+        finally:
+            for _ in range(len(batch) + stopping):
+                work_queue.task_done()
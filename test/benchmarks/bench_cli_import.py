@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+
+# Filename: bench_cli_import.py
+# Created on: October 18, 2026
+# Author: Lucas Araújo <araujolucas@dcc.ufmg.br>
+
+"""
+Import time of each control subcommand of 'python3 -m pomo'.
+
+Runs every subcommand with -X importtime against an empty runtime
+directory (so no pomodoro is listening and nothing is changed), reports
+the total import time and fails if a subcommand imports one of the daemon
+modules, which would bring back the slow start.
+
+Usage: python3 test/benchmarks/bench_cli_import.py [runs]
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "../..")
+
+SUBCOMMANDS = [
+    ["toggle"],
+    ["end"],
+    ["lock"],
+    ["exit"],
+    ["status"],
+    ["tag", "bench"],
+    ["time", "+60"],
+]
+
+# Modules only the daemon needs
+FORBIDDEN = {
+    "asyncio",
+    "logging",
+    "sqlite3",
+    "pomo.pomodoro",
+    "pomo.status",
+    "pomo.timer",
+    "pomo.db_manager",
+    "pomo.server",
+}
+
+
+def import_profile(subcommand, runtime_dir):
+    """
+    Run a subcommand and parse its -X importtime report
+
+    Returns:
+        tuple: The total import time in ms and the set of imported modules
+    """
+    env = dict(os.environ, XDG_RUNTIME_DIR=runtime_dir, PYTHONPATH=ROOT)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "pomo", *subcommand],
+        env=env,
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+    )
+
+    total = 0
+    modules = set()
+
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+
+        _, cumulative, name = line[len("import time:"):].split("|")
+        modules.add(name.strip())
+
+        # Only top level imports, their cumulative time includes the rest
+        if not name.startswith("  "):
+            total += int(cumulative)
+
+    return total / 1e3, modules
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    failed = False
+
+    with tempfile.TemporaryDirectory() as runtime_dir:
+        print(f"Import time per subcommand, best of {runs} runs")
+
+        for subcommand in SUBCOMMANDS:
+            profiles = [import_profile(subcommand, runtime_dir) for _ in range(runs)]
+            best = min(total for total, _ in profiles)
+            loaded = FORBIDDEN & profiles[0][1]
+
+            print(f"  {' '.join(subcommand):12} {best:8.2f} ms")
+
+            if loaded:
+                print(f"    imports daemon modules: {', '.join(sorted(loaded))}")
+                failed = True
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+
+# Filename: bench_log_manager.py
+# Created on: October 18, 2026
+# Author: Lucas Araújo <araujolucas@dcc.ufmg.br>
+
+"""
+Per-call cost of LogManager.log.
+
+Compares the current LogManager with the previous implementation, which
+walked the stack with inspect.stack() and reopened the log file for every
+message. Both write to a temporary file.
+
+Usage: python3 test/benchmarks/bench_log_manager.py
+"""
+
+import datetime
+import inspect
+import logging
+import os
+import re
+import sys
+import tempfile
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../.."))
+
+import pomo.log_manager as log_manager  # noqa: E402
+
+TMPDIR = tempfile.mkdtemp()
+log_manager.LOGFILE = os.path.join(TMPDIR, "pomo.log")
+LEGACY_LOGFILE = os.path.join(TMPDIR, "legacy.log")
+
+
+class LegacyLogManager:
+    """
+    The previous LogManager
+    """
+
+    def log(self, text, level="INFO"):
+        text = text.replace("\n", " ")
+        text = re.sub(r"\s+", " ", text)
+
+        timestamp = datetime.datetime.now().strftime("%a %Y-%m-%d %H:%M:%S")
+
+        caller = inspect.stack()[1]
+        caller_function_name = caller.function
+        caller_class_name = caller.frame.f_locals.get("self", None).__class__.__name__
+
+        message = f"[{timestamp}] [{level}] {caller_class_name}::{caller_function_name} : {text}"
+
+        with open(LEGACY_LOGFILE, "a") as f:
+            f.write(message + "\n")
+
+
+class Caller:
+    """
+    Logs from a method, like the classes of pomo do
+    """
+
+    def __init__(self, manager):
+        self.manager = manager
+
+    def log_info(self):
+        self.manager.log("Finished session in database", level="INFO")
+
+    def log_debug(self):
+        self.manager.log("Performing query: SELECT 1", level="DEBUG")
+
+
+def measure(func, number):
+    """
+    Get the cost of one call, in microseconds
+    """
+    return timeit.timeit(func, number=number) / number * 1e6
+
+
+def main():
+    manager = log_manager.LogManager()
+    manager.logger.setLevel(logging.INFO)
+
+    legacy = Caller(LegacyLogManager())
+    current = Caller(manager)
+
+    print("Cost per LogManager.log call")
+    print(f"  legacy, written:          {measure(legacy.log_info, 2000):8.2f} us")
+    print(f"  legacy, DEBUG:            {measure(legacy.log_debug, 2000):8.2f} us")
+    print(f"  current, written:         {measure(current.log_info, 50000):8.2f} us")
+    print(f"  current, DEBUG filtered:  {measure(current.log_debug, 500000):8.2f} us")
+
+
+if __name__ == "__main__":
+    main()
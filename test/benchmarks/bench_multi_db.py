@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+
+# Filename: bench_multi_db.py
+# Created on: October 18, 2026
+# Author: Lucas Araújo <araujolucas@dcc.ufmg.br>
+
+"""
+Time of a team report over many databases.
+
+Creates synthetic databases with a year of sessions each in a temporary
+directory, then summarizes them with a growing number of worker processes.
+One worker scans the databases one after the other in the main process.
+
+Usage: python3 test/benchmarks/bench_multi_db.py [databases] [sessions per database]
+"""
+
+import os
+import sys
+import random
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../.."))
+
+from analytics.analytics import Analytics  # noqa: E402
+from pomo.db_manager import DBManager  # noqa: E402
+
+TAGS = ("study", "work", "reading", "other")
+START_TS = 1704078000  # 2024-01-01 00:00 local time
+DAY = 24 * 3600
+
+
+def create_database(path, sessions, seed):
+    """
+    Fill a database with sessions spread over a year
+    """
+    rng = random.Random(seed)
+    db_manager = DBManager(path)
+    rows = []
+
+    for i in range(sessions):
+        start_ts = START_TS + i * (365 * DAY // sessions)
+        local = db_manager.local_datetime(start_ts)
+        rows.append(
+            (
+                local.strftime("%Y-%m-%d"),
+                local.strftime("%H:%M:%S"),
+                start_ts,
+                rng.randint(300, 1500),
+                rng.choice(TAGS),
+            )
+        )
+
+    db_manager.import_sessions(rows)
+    db_manager.close()
+
+
+def main():
+    databases = int(sys.argv[1]) if len(sys.argv) > 1 else 120
+    sessions = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+
+    directory = tempfile.mkdtemp()
+    paths = [os.path.join(directory, f"user{i}.db") for i in range(databases)]
+
+    for i, path in enumerate(paths):
+        create_database(path, sessions, i)
+
+    print(f"{databases} databases with {sessions} sessions each, {os.cpu_count()} CPUs")
+
+    baseline = None
+    workers = 1
+
+    while workers <= max(os.cpu_count() or 1, 4):
+        # Without the cache, so every run scans the databases
+        analytics = Analytics(paths, workers=workers, cache=False)
+        start = time.perf_counter()
+        summary = analytics.summary("2024-01-01", "2024-12-31")
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+
+        print(
+            f"  {workers:2d} workers: {elapsed * 1000:8.1f} ms "
+            f"({baseline / elapsed:4.2f}x, {summary.sessions} sessions)"
+        )
+        workers *= 2
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+
+# Filename: bench_timer_drift.py
+# Created on: October 18, 2026
+# Author: Lucas Araújo <araujolucas@dcc.ufmg.br>
+
+"""
+Drift of the timer over simulated long sessions.
+
+Compares the deadline-based Timer with the previous implementation, which
+accumulated wall clock deltas between updates. The simulation runs a work
+session with jittered wakeups while the wall clock is slewed by NTP and
+stepped once, and reports how far each countdown ends from the true time.
+
+Usage: python3 test/benchmarks/bench_timer_drift.py
+"""
+
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../.."))
+
+from pomo.timer import Timer  # noqa: E402
+
+SESSION = 40 * 60  # seconds
+SLEW = 500e-6  # NTP slew, seconds per second
+STEP = 2.0  # wall clock jump, seconds
+STEP_AT = SESSION / 2
+
+
+class SimulatedClocks:
+    """
+    A true monotonic clock and a wall clock slewed and stepped relative to it
+    """
+
+    def __init__(self):
+        self.now = 0.0
+
+    def monotonic(self):
+        return self.now
+
+    def wall(self):
+        step = STEP if self.now >= STEP_AT else 0
+        return self.now * (1 + SLEW) + step
+
+
+class AccumulatingTimer:
+    """
+    The previous countdown: subtracts wall clock deltas on each update and
+    re-reads the clock on each tick, losing the time between both
+    """
+
+    def __init__(self, remtime, clock):
+        self.time = remtime
+        self.clock = clock
+        self.tick()
+
+    def tick(self):
+        self.previous = self.clock()
+
+    def update(self):
+        self.time -= self.clock() - self.previous
+
+
+def simulate(seed):
+    """
+    Run one session and return the final error of both timers, in seconds
+    """
+    rng = random.Random(seed)
+    clocks = SimulatedClocks()
+
+    timer = Timer(SESSION, "bench", "break", clock=clocks.monotonic)
+    timer.sound_played = timer.notified_finish = True
+    legacy = AccumulatingTimer(SESSION, clocks.wall)
+
+    while clocks.now < SESSION:
+        # Wake up around the next second with scheduling jitter
+        clocks.now += timer.time_to_next_event() + rng.uniform(0, 3e-3)
+        timer.update()
+        legacy.update()
+        expected = SESSION - clocks.now
+        # Loop work between the update and the tick of the legacy loop
+        clocks.now += rng.uniform(0, 1e-4)
+        legacy.tick()
+
+    return abs(timer.time - expected), abs(legacy.time - expected)
+
+
+def main():
+    runs = 20
+    results = [simulate(seed) for seed in range(runs)]
+
+    deadline = max(r[0] for r in results)
+    accumulated = max(r[1] for r in results)
+
+    print(f"{runs} simulated sessions of {SESSION // 60} min")
+    print(f"  deadline timer, max error:     {deadline * 1e3:10.3f} ms")
+    print(f"  accumulating timer, max error: {accumulated * 1e3:10.3f} ms")
+
+    clock = SimulatedClocks()
+    timer = Timer(SESSION, "bench", "break", clock=clock.monotonic)
+    timer.sound_played = timer.notified_finish = True
+    number = 200000
+    cost = timeit.timeit(timer.update, number=number) / number
+
+    print(f"  Timer.update cost:             {cost * 1e9:10.1f} ns")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+
+# Filename: test_analytics_cache.py
+# Created on: October 18, 2026
+# Author: Lucas Araújo <araujolucas@dcc.ufmg.br>
+
+import pytest
+
+from analytics.cache import AnalyticsCache
+
+
+class Loader:
+    """
+    Range loader counting the ranges it was asked for
+    """
+
+    def __init__(self):
+        self.ranges = []
+
+    def __call__(self, start, end):
+        self.ranges.append((start, end))
+        return [(start, end)]
+
+
+@pytest.fixture
+def cache_dir(tmp_path):
+    return str(tmp_path / "cache")
+
+
+def rows(cache_dir, versions, today="2026-10-18", start="2026-10-01", end="2026-10-18"):
+    load = Loader()
+    AnalyticsCache("pomo.db", cache_dir).rows("rollup", start, end, today, versions, load)
+
+    return load.ranges
+
+
+def test_past_days_are_kept_while_only_today_changes(cache_dir):
+    assert rows(cache_dir, (1, 0, 0, "2026-10-18")) == [
+        ("2026-10-01", "2026-10-17"),
+        ("2026-10-18", "2026-10-18"),
+    ]
+    assert rows(cache_dir, (1, 0, 0, "2026-10-18")) == []
+    assert rows(cache_dir, (1, 0, 1, "2026-10-18")) == [("2026-10-18", "2026-10-18")]
+    assert rows(cache_dir, (1, 1, 1, "2026-10-18")) == [
+        ("2026-10-01", "2026-10-17"),
+        ("2026-10-18", "2026-10-18"),
+    ]
+
+
+def test_copy_taken_mid_day_is_not_cached_as_final(cache_dir):
+    # Copy of a database last written on the 16th, read on the 18th
+    assert rows(cache_dir, (1, 0, 3, "2026-10-16")) == [
+        ("2026-10-01", "2026-10-15"),
+        ("2026-10-16", "2026-10-18"),
+    ]
+
+    # A fresher copy finished more sessions on the 16th
+    assert rows(cache_dir, (1, 0, 5, "2026-10-16")) == [("2026-10-16", "2026-10-18")]
+
+    # And then moved on to the 17th, so the 16th is final now
+    assert rows(cache_dir, (1, 0, 6, "2026-10-17")) == [
+        ("2026-10-01", "2026-10-16"),
+        ("2026-10-17", "2026-10-18"),
+    ]
+
+
+def test_different_database_at_the_same_path(cache_dir):
+    rows(cache_dir, (1, 0, 0, "2026-10-18"))
+
+    assert rows(cache_dir, (2, 0, 0, "2026-10-18")) == [
+        ("2026-10-01", "2026-10-17"),
+        ("2026-10-18", "2026-10-18"),
+    ]
+
+
+def test_empty_database_splits_at_today(cache_dir):
+    assert rows(cache_dir, (1, 0, 0, None)) == [
+        ("2026-10-01", "2026-10-17"),
+        ("2026-10-18", "2026-10-18"),
+    ]
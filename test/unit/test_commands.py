@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+
+# Filename: test_commands.py
+# Created on: October 18, 2026
+# Author: Lucas Araújo <araujolucas@dcc.ufmg.br>
+
+import socket
+from functools import partial
+from types import SimpleNamespace
+
+import pytest
+
+import pomo.commands
+from pomo.commands import Commands
+from pomo.control import ControlClient
+
+
+@pytest.fixture
+def sockfile(tmp_path, monkeypatch):
+    path = str(tmp_path / "pomo.sock")
+    monkeypatch.setattr(pomo.commands, "ControlClient", partial(ControlClient, sockfile=path))
+    monkeypatch.setattr(pomo.commands, "SOCKFILE", path)
+
+    return path
+
+
+def test_exit_without_pomodoro_succeeds(sockfile):
+    assert Commands().run(SimpleNamespace(action="exit")) == 0
+
+
+def test_exit_with_stale_socket_succeeds(sockfile):
+    # Left behind by a pomodoro that was killed
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+    sock.bind(sockfile)
+    sock.close()
+
+    assert Commands().run(SimpleNamespace(action="exit")) == 0
+
+
+def test_other_actions_without_pomodoro_fail(sockfile, capsys):
+    assert Commands().run(SimpleNamespace(action="toggle")) == 1
+    assert "No instance of pomodoro listening" in capsys.readouterr().err
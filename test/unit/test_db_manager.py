@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+
+# Filename: test_db_manager.py
+# Created on: October 18, 2026
+# Author: Lucas Araújo <araujolucas@dcc.ufmg.br>
+
+import pytest
+
+from pomo.db_manager import DBManager
+
+
+@pytest.fixture
+def db_manager(tmp_path):
+    db_manager = DBManager(str(tmp_path / "pomo.db"))
+    yield db_manager
+    db_manager.close()
+
+
+def test_retagged_session_is_rolled_up_under_the_new_tag(db_manager):
+    db_manager.create_session("a")
+    db_manager.update_tag("b")
+    db_manager.finish_session(60)
+
+    today = db_manager.today()
+
+    assert list(db_manager.iter_rollup(today, today)) == [(today, "b", 60, 1)]
+    _, history_version, data_version, last_day = db_manager.get_versions()
+    assert (history_version, data_version, last_day) == (0, 2, today)
+
+
+def test_finished_session_counts_its_spans(db_manager):
+    db_manager.create_session("a", start_ts=1792300000)
+    db_manager.add_intervals([(1792300000, 1792300600, 10, 610)])
+    db_manager.finish_session(9999, [(1792300900, 1792301200, 910, 1210)])
+
+    day = db_manager.local_datetime(1792300000).strftime("%Y-%m-%d")
+
+    assert list(db_manager.iter_rollup(day, day)) == [(day, "a", 900, 1)]
+
+
+def test_imported_sessions_from_a_generator_are_rolled_up(db_manager):
+    rows = [
+        ("2026-10-01", "09:00:00", 1790848800, 1500, "a"),
+        ("2026-10-01", "10:00:00", 1790852400, 1500, "a"),
+        ("2026-10-02", "09:00:00", 1790935200, 600, "b"),
+    ]
+
+    assert db_manager.import_sessions(row for row in rows) == 3
+    assert list(db_manager.iter_rollup("2026-10-01", "2026-10-02")) == [
+        ("2026-10-01", "a", 3000, 2),
+        ("2026-10-02", "b", 600, 1),
+    ]
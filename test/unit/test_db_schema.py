@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+
+# Filename: test_db_schema.py
+# Created on: October 18, 2026
+# Author: Lucas Araújo <araujolucas@dcc.ufmg.br>
+
+import sqlite3
+
+import pytest
+
+from pomo.db_manager import DBManager
+from pomo.db_schema import DBSchema
+
+# (date, start, duration, tag) of the legacy sessions, the last one still open
+SESSIONS = [
+    ("2026-10-17", "09:00:00", 1200, "a"),
+    ("2026-10-16", "10:00:00", 600, "b"),
+    ("2026-10-16", "09:00:00", 1500, "a"),
+    ("2026-10-17", "14:00:00", None, "a"),
+]
+
+ROLLUP = [
+    ("2026-10-16", "a", 1500, 1),
+    ("2026-10-16", "b", 600, 1),
+    ("2026-10-17", "a", 1200, 1),
+]
+
+
+def create_version(connection, version):
+    """
+    Create the schema of a past version, as it was shipped, with SESSIONS
+    """
+    if version == 0:
+        connection.execute(
+            "CREATE TABLE sessions (date TEXT, start TEXT, duration INTEGER, tag TEXT)"
+        )
+        connection.executemany("INSERT INTO sessions VALUES (?, ?, ?, ?)", SESSIONS)
+        return
+
+    connection.execute(
+        """CREATE TABLE sessions (
+               id INTEGER PRIMARY KEY,
+               date TEXT,
+               start TEXT,
+               start_ts INTEGER,
+               duration INTEGER,
+               tag TEXT)"""
+    )
+    connection.execute("CREATE INDEX idx_sessions_date ON sessions (date)")
+    connection.execute("CREATE INDEX idx_sessions_tag ON sessions (tag)")
+    connection.executemany(
+        "INSERT INTO sessions (date, start, start_ts, duration, tag) VALUES (?, ?, ?, ?, ?)",
+        [
+            (date, start, start_ts(date, start), duration, tag)
+            for date, start, duration, tag in sorted(SESSIONS)
+        ],
+    )
+
+    if version >= 2:
+        connection.execute(
+            """CREATE TABLE daily_tag_rollup (
+                   date TEXT NOT NULL,
+                   tag TEXT NOT NULL,
+                   seconds INTEGER NOT NULL,
+                   count INTEGER NOT NULL,
+                   PRIMARY KEY (date, tag)) WITHOUT ROWID"""
+        )
+        connection.executemany("INSERT INTO daily_tag_rollup VALUES (?, ?, ?, ?)", ROLLUP)
+
+    if version >= 3:
+        connection.execute("CREATE INDEX idx_sessions_start_tag ON sessions (start_ts, tag)")
+
+    if version >= 4:
+        connection.execute(
+            "CREATE TABLE meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL) WITHOUT ROWID"
+        )
+        connection.execute(
+            "INSERT INTO meta VALUES ('history_version', 3), ('data_version', 7)"
+        )
+
+    if version >= 5:
+        connection.execute(
+            """CREATE TABLE session_intervals (
+                   id INTEGER PRIMARY KEY,
+                   session_id INTEGER NOT NULL REFERENCES sessions (id),
+                   start REAL NOT NULL,
+                   stop REAL NOT NULL,
+                   start_mono REAL NOT NULL,
+                   stop_mono REAL NOT NULL)"""
+        )
+
+    connection.execute(f"PRAGMA user_version = {version}")
+
+
+def start_ts(date, start):
+    hours, minutes, seconds = map(int, start.split(":"))
+
+    return DBManager().date_to_timestamp(date) + hours * 3600 + minutes * 60 + seconds
+
+
+def meta(connection):
+    return dict(connection.execute("SELECT key, value FROM meta"))
+
+
+@pytest.mark.parametrize("version", range(DBSchema.VERSION))
+def test_migrate_from(tmp_path, version):
+    connection = sqlite3.connect(tmp_path / "pomo.db")
+    create_version(connection, version)
+    connection.commit()
+
+    DBSchema().ensure(connection)
+
+    assert DBSchema().get_version(connection) == DBSchema.VERSION
+    assert (
+        connection.execute("SELECT * FROM daily_tag_rollup ORDER BY date, tag").fetchall()
+        == ROLLUP
+    )
+
+    # Ids follow the history, and start_ts matches the local date and time
+    assert connection.execute(
+        "SELECT date, start, start_ts, duration, tag FROM sessions ORDER BY id"
+    ).fetchall() == [
+        (date, start, start_ts(date, start), duration, tag)
+        for date, start, duration, tag in sorted(SESSIONS)
+    ]
+
+    counters = meta(connection)
+    expected = (3, 7) if version >= 4 else (0, 0)
+    assert (counters["history_version"], counters["data_version"]) == expected
+    assert isinstance(counters["database_id"], int)
+
+    assert DBSchema().has_table(connection, "session_intervals")
+
+
+def test_create_and_reopen(tmp_path):
+    connection = sqlite3.connect(tmp_path / "pomo.db")
+    DBSchema().ensure(connection)
+    database_id = meta(connection)["database_id"]
+
+    DBSchema().ensure(connection)
+
+    assert DBSchema().get_version(connection) == DBSchema.VERSION
+    assert meta(connection) == {
+        "history_version": 0,
+        "data_version": 0,
+        "database_id": database_id,
+    }
+
+
+def test_databases_get_different_ids(tmp_path):
+    ids = set()
+
+    for name in ("a.db", "b.db"):
+        connection = sqlite3.connect(tmp_path / name)
+        DBSchema().ensure(connection)
+        ids.add(meta(connection)["database_id"])
+
+    assert len(ids) == 2
+
+
+@pytest.mark.parametrize("version", [0, 3, DBSchema.VERSION])
+def test_read_only_database_is_not_migrated(tmp_path, version):
+    path = tmp_path / "pomo.db"
+    connection = sqlite3.connect(path)
+
+    if version == DBSchema.VERSION:
+        DBSchema().ensure(connection)
+    else:
+        create_version(connection, version)
+
+    connection.commit()
+    connection.close()
+    content = path.read_bytes()
+
+    db_manager = DBManager(str(path), read_only=True)
+
+    try:
+        rows = list(db_manager.iter_rollup("2026-10-16", "2026-10-17"))
+        versions = db_manager.get_versions()
+
+    finally:
+        db_manager.close()
+
+    # An outdated database is migrated in memory only
+    assert rows == ([] if version == DBSchema.VERSION else ROLLUP)
+    assert versions[1:3] == (0, 0)
+    assert path.read_bytes() == content
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["pomo.db"]
+
+
+def test_missing_read_only_database_is_empty(tmp_path):
+    path = tmp_path / "pomo.db"
+    db_manager = DBManager(str(path), read_only=True)
+
+    try:
+        assert list(db_manager.iter_rollup("2026-10-16", "2026-10-17")) == []
+
+    finally:
+        db_manager.close()
+
+    assert not path.exists()
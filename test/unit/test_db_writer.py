@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+
+# Filename: test_db_writer.py
+# Created on: October 18, 2026
+# Author: Lucas Araújo <araujolucas@dcc.ufmg.br>
+
+import time
+import sqlite3
+
+import pytest
+
+from pomo.db_manager import DBManager
+from pomo.db_writer import DBWriter
+
+
+@pytest.fixture(autouse=True)
+def no_retry_delay(monkeypatch):
+    monkeypatch.setattr("pomo.db_writer.DB_WRITER_RETRY_DELAY", 0)
+
+
+@pytest.fixture
+def db_manager(tmp_path):
+    db_manager = DBManager(str(tmp_path / "pomo.db"))
+    yield db_manager
+    db_manager.close()
+
+
+@pytest.fixture
+def writer(db_manager):
+    writer = DBWriter(db_manager)
+    writer.start()
+    yield writer
+    writer.close()
+
+
+def sessions(db_manager):
+    return db_manager.perform_query("SELECT tag, duration FROM sessions")
+
+
+def fail_once(monkeypatch, db_manager, method, error):
+    original = getattr(db_manager, method)
+    calls = []
+
+    def failing(*args):
+        calls.append(args)
+
+        if len(calls) == 1:
+            raise error
+
+        return original(*args)
+
+    monkeypatch.setattr(db_manager, method, failing)
+
+    return calls
+
+
+def test_coalesce_keeps_last_tag_and_joins_intervals():
+    writer = DBWriter(None)
+    merged = writer.coalesce(
+        [
+            ("create_session", ("a", 1)),
+            ("update_tag", ("b",)),
+            ("update_tag", ("c",)),
+            ("add_intervals", ([(1, 2, 1, 2)],)),
+            ("add_intervals", ([(3, 4, 3, 4)],)),
+            ("update_tag", ("d",)),
+        ]
+    )
+
+    assert merged == [
+        ("create_session", ("a", 1)),
+        ("update_tag", ("c",)),
+        ("add_intervals", ([(1, 2, 1, 2), (3, 4, 3, 4)],)),
+        ("update_tag", ("d",)),
+    ]
+    assert writer.coalesced == 2
+
+
+def test_writes_are_applied_in_order(writer, db_manager):
+    writer.create_session("a")
+    writer.update_tag("b")
+    writer.finish_session(60)
+
+    assert writer.flush()
+    assert sessions(db_manager) == [("b", 60)]
+    assert writer.session_start_ts is None
+
+
+def test_busy_database_is_retried(writer, db_manager, monkeypatch):
+    calls = fail_once(
+        monkeypatch, db_manager, "finish_session", sqlite3.OperationalError("database is locked")
+    )
+
+    writer.create_session("a")
+    writer.finish_session(60)
+
+    assert writer.flush()
+    assert len(calls) == 2
+    assert sessions(db_manager) == [("a", 60)]
+    assert writer.get_metrics()["failed"] == 0
+
+
+def locked(*args):
+    raise sqlite3.OperationalError("database is locked")
+
+
+def test_busy_database_keeps_writes_pending(writer, db_manager, monkeypatch):
+    monkeypatch.setattr(db_manager, "finish_session", locked)
+
+    writer.create_session("a")
+    writer.finish_session(60, [(1, 2, 1, 2)])
+
+    # Retried until the writer is closed, then left for the next instance
+    assert not writer.flush(timeout=0.1)
+    assert writer.close()
+
+    # The session created in the rolled back transaction is forgotten too
+    assert sessions(db_manager) == []
+    assert db_manager.session_id is None
+    assert writer.get_metrics()["failed"] >= 1
+    assert [write[2] for write in writer.pending] == ["create_session", "finish_session"]
+
+
+def test_pending_writes_are_replayed(db_manager, monkeypatch):
+    first = DBWriter(db_manager)
+    first.start()
+    first.create_session("a")
+    assert first.flush()
+
+    monkeypatch.setattr(db_manager, "finish_session", locked)
+    first.finish_session(60, [(10, 70, 10, 70)])
+    assert first.close()
+    pending = first.get_pending()
+    monkeypatch.undo()
+
+    # The next instance, with the pending writes from the journal
+    db_manager.session_id = None
+    second = DBWriter(db_manager)
+    second.start()
+    second.replay(pending, "a")
+    assert second.flush()
+
+    assert sessions(db_manager) == [("a", 60)]
+    assert second.pending == []
+
+    # Replaying writes that were committed after all changes nothing
+    second.replay(pending, "a")
+    second.close()
+
+    assert sessions(db_manager) == [("a", 60)]
+    assert db_manager.perform_query("SELECT COUNT(*) FROM session_intervals") == [(1,)]
+
+
+def test_unexpected_error_does_not_kill_the_writer(writer, db_manager, monkeypatch):
+    calls = fail_once(monkeypatch, db_manager, "update_tag", TypeError("no row"))
+
+    writer.create_session("a")
+    assert writer.flush()
+    writer.update_tag("b")
+    assert writer.flush()
+
+    # Not retried, counted, and the next writes still go through
+    assert len(calls) == 1
+    assert writer.get_metrics()["errors"] == 1
+    assert writer.thread.is_alive()
+
+    writer.finish_session(60)
+
+    assert writer.flush()
+    assert sessions(db_manager) == [("a", 60)]
+
+
+def test_unopenable_database_does_not_hang_the_writer(tmp_path):
+    # A directory can not be opened as a database
+    writer = DBWriter(DBManager(str(tmp_path)))
+    writer.start()
+
+    writer.create_session("a")
+
+    assert not writer.flush(timeout=0.1)
+    assert writer.close(timeout=5)
+    assert len(writer.pending) == 1
+
+
+def test_flush_times_out(db_manager):
+    writer = DBWriter(db_manager)
+    # Pretend the thread is running, without anything taking from the queue
+    writer.thread = object()
+    writer.submit("update_tag", "a")
+
+    assert not writer.flush(timeout=0.01)
+
+
+def test_full_queue_does_not_block(db_manager):
+    writer = DBWriter(db_manager, max_queue=1)
+    writer.create_session("a")
+    writer.update_tag("b")
+    writer.finish_session(60)
+
+    metrics = writer.get_metrics()
+    assert (metrics["queue_depth"], metrics["unqueued"], metrics["pending"]) == (1, 2, 3)
+    assert metrics["overflows"] == 2
+
+    writer.start()
+    assert writer.flush()
+    assert writer.close()
+
+    assert sessions(db_manager) == [("b", 60)]
+    assert writer.pending == []
+    assert writer.unqueued == []
+
+
+def test_close_returns_by_its_deadline(db_manager, monkeypatch):
+    writer = DBWriter(db_manager, max_queue=1)
+    monkeypatch.setattr(db_manager, "update_tag", locked)
+    writer.start()
+    writer.session_start_ts = 1
+
+    # The writer retries the first one, the second one fills the queue
+    writer.update_tag("a")
+    writer.update_tag("b")
+
+    start = time.monotonic()
+    writer.close(timeout=0.2)
+
+    assert time.monotonic() - start < 1
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+
+# Filename: test_importer.py
+# Created on: October 18, 2026
+# Author: Lucas Araújo <araujolucas@dcc.ufmg.br>
+
+from analytics.importer import Importer
+from pomo.db_manager import DBManager
+
+
+def test_local_start_and_timestamp_give_the_same_row(tmp_path):
+    db_manager = DBManager(str(tmp_path / "pomo.db"))
+    importer = Importer(db_manager)
+
+    by_ts = importer.to_row({"start_ts": "1792300000", "duration": "1500", "tag": "a"})
+    by_date = importer.to_row(
+        {"date": by_ts[0], "start": by_ts[1], "duration": "1500", "tag": "a"}
+    )
+
+    assert by_date == by_ts == (
+        db_manager.local_datetime(1792300000).strftime("%Y-%m-%d"),
+        db_manager.local_datetime(1792300000).strftime("%H:%M:%S"),
+        1792300000,
+        1500,
+        "a",
+    )
+
+
+def test_import_twice_skips_duplicates(tmp_path):
+    db_manager = DBManager(str(tmp_path / "pomo.db"))
+    source = tmp_path / "sessions.csv"
+    source.write_text(
+        "date,start,duration,tag\n"
+        "2026-10-16,09:00:00,1500,a\n"
+        "2026-10-16,10:00:00,600,\n"
+    )
+
+    first = Importer(db_manager).import_file(str(source))
+    second = Importer(db_manager).import_file(str(source))
+
+    assert (first.read, first.inserted) == (2, 2)
+    assert (second.read, second.inserted) == (2, 0)
+    assert list(db_manager.iter_rollup("2026-10-16", "2026-10-16")) == [
+        ("2026-10-16", "", 600, 1),
+        ("2026-10-16", "a", 1500, 1),
+    ]
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+
+# Filename: test_journal.py
+# Created on: October 18, 2026
+# Author: Lucas Araújo <araujolucas@dcc.ufmg.br>
+
+import os
+import json
+from argparse import Namespace
+
+from pomo.journal import Journal
+from pomo.pomodoro import Pomodoro
+
+
+def make_pomodoro(database):
+    return Pomodoro(Namespace(worktime=1500, breaktime=300, tag="test", database=database))
+
+
+def test_recover_creates_missing_config_dir(tmp_path):
+    database = tmp_path / "config" / "pomo" / "pomo.db"
+    pomodoro = make_pomodoro(str(database))
+
+    pomodoro.recover()
+
+    with open(pomodoro.journal.path) as f:
+        records = [json.loads(line) for line in f]
+
+    assert [record["type"] for record in records] == ["checkpoint"]
+    assert not os.path.exists(pomodoro.journal.path + ".tmp")
+
+
+def test_replay_applies_events_after_checkpoint(tmp_path):
+    journal = Journal(str(tmp_path / "pomo.db"))
+    journal.checkpoint({"status": "work", "active": False, "tag": "a"})
+    journal.record("toggle", {"status": "work", "active": True, "tag": "a"})
+    journal.record("tag", {"status": "work", "active": True, "tag": "b"})
+    journal.close()
+
+    # A torn last line is ignored
+    with open(journal.path, "a") as f:
+        f.write('{"type": "event", "cha')
+
+    state, wall = Journal(str(tmp_path / "pomo.db")).replay()
+
+    assert state == {"status": "work", "active": True, "tag": "b"}
+    assert wall is not None
+
+
+def test_writer_thread_keeps_the_order_of_records(tmp_path):
+    journal = Journal(str(tmp_path / "pomo.db"))
+    journal.start()
+
+    journal.checkpoint({"status": "work", "active": False, "tag": "a"})
+    for tag in "bcd":
+        journal.record("tag", {"status": "work", "active": False, "tag": tag})
+    journal.compact({"status": "break", "active": True, "tag": "d"})
+    journal.record("toggle", {"status": "break", "active": False, "tag": "d"})
+
+    assert journal.close()
+    assert journal.thread is None
+
+    replayed = Journal(str(tmp_path / "pomo.db"))
+    state, _ = replayed.replay()
+
+    assert state == {"status": "break", "active": False, "tag": "d"}
+    assert replayed.records == 2
@@ -0,0 +1,18 @@
+#!/usr/bin/env python3
+
+# Filename: test_log_manager.py
+# Created on: October 18, 2026
+# Author: Lucas Araújo <araujolucas@dcc.ufmg.br>
+
+import logging
+
+from pomo.log_manager import Formatter, LogManager
+
+
+def test_warnings_are_written_as_warn_only_in_the_log_file():
+    LogManager()
+    record = logging.LogRecord("pomo", logging.WARNING, __file__, 1, "careful", None, None)
+
+    assert Formatter("[%(levelname)s] %(message)s").format(record) == "[WARN] careful"
+    assert record.levelname == "WARNING"
+    assert logging.getLevelName(logging.WARNING) == "WARNING"
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+
+# Filename: test_pomodoro.py
+# Created on: October 18, 2026
+# Author: Lucas Araújo <araujolucas@dcc.ufmg.br>
+
+import socket
+from types import SimpleNamespace
+
+import pytest
+
+from pomo.config import DATAGRAM_SIZE
+from pomo.control import ControlClient
+from pomo.pomodoro import Pomodoro
+from pomo.utils import Exit
+
+
+@pytest.fixture
+def pomodoro(tmp_path):
+    args = SimpleNamespace(
+        worktime=1500, breaktime=300, tag="other", database=str(tmp_path / "pomo.db")
+    )
+    pomodoro = Pomodoro(args)
+    yield pomodoro
+    pomodoro.db_manager.close()
+
+
+@pytest.fixture
+def sockets(tmp_path):
+    """
+    The command socket of the daemon and a control client connected to it
+    """
+    path = str(tmp_path / "pomo.sock")
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+    sock.bind(path)
+    control = ControlClient(sockfile=path)
+
+    yield sock, control
+
+    control.close()
+    sock.close()
+
+
+def receive(pomodoro, sock):
+    """
+    Handle the next message waiting on the command socket
+    """
+    data, address = sock.recvfrom(DATAGRAM_SIZE)
+    pomodoro.handle_message(sock, data, address)
+
+
+def test_batch_is_answered_with_each_result(pomodoro, sockets):
+    sock, control = sockets
+    request_id = control.submit(["lock", "time add 60", "tag study"], reply=True)
+    receive(pomodoro, sock)
+
+    reply = control.get_reply(timeout=1)
+
+    assert reply["id"] == request_id
+    assert reply["results"] == [
+        {"command": "lock", "ok": True},
+        {"command": "time add 60", "ok": True},
+        {"command": "tag study", "ok": True},
+    ]
+    assert reply["status"]["tag"] == "study"
+    assert reply["status"]["remaining"] == 1560
+    assert pomodoro.journal.state["tag"] == "study"
+
+
+def test_failed_action_does_not_stop_the_batch(pomodoro, sockets):
+    sock, control = sockets
+    control.submit(["jump", "lock", "time add x", "tag study"], reply=True)
+    receive(pomodoro, sock)
+
+    results = control.get_reply(timeout=1)["results"]
+
+    assert [result["ok"] for result in results] == [False, True, False, True]
+    assert results[0]["error"] == "Unknown action 'jump'"
+    assert "error" in results[2]
+    assert pomodoro.status.locked is False
+    assert pomodoro.status.tag == "study"
+
+
+def test_metrics_are_returned_in_the_result(pomodoro, sockets):
+    sock, control = sockets
+    control.submit(["metrics"], reply=True)
+    receive(pomodoro, sock)
+
+    result = control.get_reply(timeout=1)["results"][0]
+
+    assert result["ok"] is True
+    assert result["metrics"]["queue_depth"] == 0
+
+
+def test_request_without_reply_is_not_answered(pomodoro, sockets):
+    sock, control = sockets
+    control.submit(["lock"], reply=False)
+    receive(pomodoro, sock)
+
+    assert pomodoro.status.locked is False
+    assert control.get_reply(timeout=0.05) is None
+
+
+def test_plain_text_datagram_is_a_single_action(pomodoro, sockets):
+    sock, control = sockets
+    control.send_message(b"tag study")
+    receive(pomodoro, sock)
+
+    assert pomodoro.status.tag == "study"
+    assert control.get_reply(timeout=0.05) is None
+
+
+def test_malformed_request_is_ignored(pomodoro, sockets):
+    sock, control = sockets
+    control.send_message(b'{"commands": "lock", "reply": true}')
+    receive(pomodoro, sock)
+
+    assert pomodoro.status.locked is True
+    assert control.get_reply(timeout=0.05) is None
+
+
+def test_exit_stops_the_batch_and_defers_the_reply(pomodoro, sockets):
+    sock, control = sockets
+    control.submit(["lock", "exit", "tag study"], reply=True)
+
+    with pytest.raises(Exit):
+        receive(pomodoro, sock)
+
+    # Sent by run() once everything is on disk
+    assert control.get_reply(timeout=0.05) is None
+
+    reply, address = pomodoro.exit_reply
+    assert reply["results"] == [
+        {"command": "lock", "ok": True},
+        {"command": "exit", "ok": True},
+    ]
+    assert pomodoro.status.tag == "other"
+
+    pomodoro.send_reply(sock, reply, address)
+    assert control.get_reply(timeout=1)["results"] == reply["results"]
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+
+# Filename: test_protocol.py
+# Created on: October 18, 2026
+# Author: Lucas Araújo <araujolucas@dcc.ufmg.br>
+
+import json
+import socket
+
+import pytest
+
+import pomo.client
+from pomo.client import Client
+from pomo.protocol import FrameReader, encode_frame
+
+
+def test_partial_frame_waits_for_the_rest():
+    reader = FrameReader()
+    frame = encode_frame({"timer": "24:59", "tag": "a"})
+
+    assert reader.feed(frame[:5]) == []
+    assert reader.feed(frame[5:-1]) == []
+    assert reader.feed(frame[-1:]) == [{"timer": "24:59", "tag": "a"}]
+    assert reader.buffer == b""
+
+
+def test_coalesced_frames_are_decoded_in_order():
+    reader = FrameReader()
+    data = encode_frame({"n": 1}) + encode_frame({"n": 2}) + encode_frame({"n": 3})
+
+    assert reader.feed(data[:-4]) == [{"n": 1}, {"n": 2}]
+    assert reader.feed(data[-4:]) == [{"n": 3}]
+
+
+def test_empty_lines_are_skipped():
+    reader = FrameReader()
+
+    assert reader.feed(b"\n\n") == []
+    assert reader.feed(b"\n" + encode_frame({"n": 1}) + b"\n") == [{"n": 1}]
+    assert reader.feed(b"") == []
+
+
+def test_newlines_inside_strings_do_not_split_frames():
+    reader = FrameReader()
+
+    assert reader.feed(encode_frame({"tag": "a\nb"})) == [{"tag": "a\nb"}]
+
+
+@pytest.fixture
+def server_socket(tmp_path, monkeypatch):
+    path = str(tmp_path / "s")
+    monkeypatch.setattr(pomo.client, "SERVER_SOCKFILE", path)
+
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    listener.bind(path)
+    listener.listen()
+    yield listener
+    listener.close()
+
+
+def connect(server_socket, mode="full"):
+    """
+    Connect a client, returning it with the server end of its connection
+    """
+    client = Client(mode)
+    connection, _ = server_socket.accept()
+    connection.settimeout(1)
+
+    return client, connection
+
+
+def test_client_asks_for_its_mode(server_socket):
+    client, connection = connect(server_socket, "delta")
+
+    with client, connection:
+        assert json.loads(connection.recv(1024)) == {"mode": "delta"}
+
+
+def test_newest_snapshot_wins(server_socket):
+    client, connection = connect(server_socket)
+
+    with client, connection:
+        connection.sendall(
+            encode_frame({"timer": "25:00"})
+            + encode_frame({"timer": "24:59"})
+            + encode_frame({"timer": "24:58"})[:4]
+        )
+        assert client.get_status(timeout=1) == {"timer": "24:59"}
+
+        # The partial frame is completed by the next packet
+        connection.sendall(encode_frame({"timer": "24:58"})[4:])
+        assert client.get_status(timeout=1) == {"timer": "24:58"}
+
+
+def test_deltas_update_the_last_snapshot(server_socket):
+    client, connection = connect(server_socket, "delta")
+
+    with client, connection:
+        connection.recv(1024)
+        connection.sendall(
+            encode_frame({"timer": "25:00", "tag": "a"})
+            + encode_frame({"delta": {"timer": "24:59"}})
+        )
+
+        assert client.get_status(timeout=1) == {"timer": "24:59", "tag": "a"}
+
+
+def test_nothing_new_returns_none(server_socket):
+    client, connection = connect(server_socket)
+
+    with client, connection:
+        assert client.get_status(timeout=0.01) is None
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+
+# Filename: test_server.py
+# Created on: October 18, 2026
+# Author: Lucas Araújo <araujolucas@dcc.ufmg.br>
+
+import json
+
+import pytest
+
+from pomo.config import SERVER_CLIENT_BACKLOG, SERVER_MAX_SKIPPED_FRAMES
+from pomo.server import Server
+
+
+class Status:
+    """
+    Status returning the snapshot set by the test
+    """
+
+    def __init__(self):
+        self.current = {
+            "status": "work",
+            "timer": "25:00",
+            "active": True,
+            "remaining": 1500,
+            "tag": "other",
+            "total_time": 1500,
+            "deadline": 1000.0,
+        }
+
+    def snapshot(self):
+        return dict(self.current)
+
+
+class Transport:
+    def __init__(self):
+        self.buffered = 0
+        self.closing = False
+
+    def is_closing(self):
+        return self.closing
+
+    def get_write_buffer_size(self):
+        return self.buffered
+
+
+class Writer:
+    """
+    Stream writer keeping the frames written to it
+    """
+
+    def __init__(self):
+        self.transport = Transport()
+        self.frames = []
+        self.closed = False
+
+    def write(self, data):
+        self.frames.append(json.loads(data))
+
+    def close(self):
+        self.closed = True
+
+    def take(self):
+        frames, self.frames = self.frames, []
+        return frames
+
+
+@pytest.fixture
+def status():
+    return Status()
+
+
+@pytest.fixture
+def server(status):
+    return Server(status)
+
+
+def connect(server, mode="full"):
+    """
+    Register a client as handle_client does, with the given stream mode
+    """
+    server.last_client_id += 1
+    client_id = server.last_client_id
+    writer = Writer()
+
+    server.clients[client_id] = writer
+    server.skipped[client_id] = 0
+    server.modes[client_id] = "full"
+    server.total_clients += 1
+
+    if mode != "full":
+        server.handle_request(client_id, json.dumps({"mode": mode}).encode())
+
+    return writer
+
+
+def tick(server, status, remaining):
+    """
+    Publish a running countdown one step further
+    """
+    status.current["remaining"] = remaining
+    status.current["timer"] = f"{remaining // 60:02d}:{remaining % 60:02d}"
+    server.publish()
+
+
+def test_each_mode_gets_its_frame(server, status):
+    full, delta, sync = connect(server), connect(server, "delta"), connect(server, "sync")
+    server.publish()
+    full.take(), delta.take(), sync.take()
+
+    tick(server, status, 1499)
+
+    assert full.take() == [status.snapshot()]
+    assert delta.take() == [{"delta": {"timer": "24:59", "remaining": 1499}}]
+    assert sync.take() == []
+
+
+def test_unchanged_status_is_not_published(server, status):
+    full = connect(server)
+    server.publish()
+    full.take()
+
+    server.publish()
+
+    assert full.take() == []
+
+
+def test_delta_client_starts_with_a_full_snapshot(server, status):
+    server.last_snapshot = status.snapshot()
+    delta = connect(server, "delta")
+
+    tick(server, status, 1499)
+    tick(server, status, 1498)
+
+    assert delta.take() == [
+        status.snapshot() | {"timer": "24:59", "remaining": 1499},
+        {"delta": {"timer": "24:58", "remaining": 1498}},
+    ]
+
+
+def test_delta_client_gets_a_full_snapshot_after_a_skipped_frame(server, status):
+    delta = connect(server, "delta")
+    server.publish()
+    delta.take()
+
+    delta.transport.buffered = SERVER_CLIENT_BACKLOG + 1
+    tick(server, status, 1499)
+    delta.transport.buffered = 0
+    tick(server, status, 1498)
+    tick(server, status, 1497)
+
+    # The delta against 24:59 would not apply to what the client has
+    assert delta.take() == [
+        status.snapshot() | {"timer": "24:58", "remaining": 1498},
+        {"delta": {"timer": "24:57", "remaining": 1497}},
+    ]
+
+
+def test_sync_client_gets_events_only(server, status):
+    sync = connect(server, "sync")
+    server.publish()
+    sync.take()
+
+    tick(server, status, 1499)
+    assert sync.take() == []
+
+    status.current["tag"] = "study"
+    server.publish()
+    assert sync.take() == [status.snapshot()]
+
+
+def test_sync_client_gets_a_moved_deadline(server, status):
+    sync = connect(server, "sync")
+    server.publish()
+    sync.take()
+
+    # Adding time moves the deadline of the running timer
+    status.current["deadline"] = 1060.0
+    tick(server, status, 1559)
+
+    assert sync.take() == [status.snapshot()]
+
+
+def test_sync_client_gets_every_change_of_a_paused_timer(server, status):
+    sync = connect(server, "sync")
+    status.current.update(active=False, deadline=None)
+    server.publish()
+    sync.take()
+
+    tick(server, status, 1440)
+
+    assert sync.take() == [status.snapshot()]
+
+
+def test_client_that_stays_behind_is_evicted(server, status):
+    full = connect(server)
+    full.transport.buffered = SERVER_CLIENT_BACKLOG + 1
+
+    for remaining in range(SERVER_MAX_SKIPPED_FRAMES + 1, -1, -1):
+        tick(server, status, remaining)
+
+    assert full.closed
+    assert server.clients == {}
+    assert server.total_clients == 0
+
+
+def test_unknown_mode_is_ignored(server, status):
+    connect(server)
+    server.handle_request(1, b'{"mode": "fast"}')
+    server.handle_request(1, b"not json")
+
+    assert server.modes[1] == "full"
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+
+# Filename: test_suspend.py
+# Created on: October 18, 2026
+# Author: Lucas Araújo <araujolucas@dcc.ufmg.br>
+
+import time
+
+import pytest
+
+from pomo.status import Status
+from pomo.suspend import ClockGapBackend, DisabledBackend, FakeBackend, SuspendDetector
+
+
+@pytest.fixture(autouse=True)
+def no_notifications(monkeypatch):
+    monkeypatch.setattr("pomo.timer.call", lambda *args, **kwargs: 0)
+    monkeypatch.setattr("pomo.status.subprocess.call", lambda *args, **kwargs: 0)
+
+
+@pytest.fixture
+def backend():
+    return FakeBackend()
+
+
+@pytest.fixture
+def status(backend):
+    return Status(1500, 300, "test", SuspendDetector(backend))
+
+
+def test_suspend_pauses_the_running_timer(status, backend):
+    status.toggle()
+    backend.suspend(120)
+    status.update()
+
+    assert not status.active
+    assert status.span is None
+
+    # The span stopped when the system went to sleep, on the wall clock
+    (start, stop, start_mono, stop_mono), = status.intervals
+    assert stop == pytest.approx(time.time() - 120, abs=1)
+    assert stop_mono - start_mono < 1
+
+
+def test_no_suspend_keeps_the_timer_running(status):
+    status.toggle()
+    status.update()
+
+    assert status.active
+    assert status.intervals == []
+
+
+def test_suspend_while_paused_is_ignored(status, backend):
+    status.toggle()
+    status.toggle()
+    backend.suspend(120)
+
+    # Resuming starts detecting from now
+    status.toggle()
+    status.update()
+
+    assert status.active
+
+
+def test_resume_after_suspend_starts_a_new_span(status, backend):
+    status.toggle()
+    backend.suspend(120)
+    status.update()
+    status.toggle()
+
+    assert status.active
+    assert status.span is not None
+    assert len(status.intervals) == 1
+
+
+def test_detector_by_name():
+    assert isinstance(SuspendDetector("fake").backend, FakeBackend)
+    assert isinstance(SuspendDetector("unknown").backend, ClockGapBackend)
+
+
+def test_clock_gap_below_threshold_is_not_a_suspend():
+    clocks = {"monotonic": 0.0, "reference": 0.0}
+    backend = ClockGapBackend(
+        threshold=5,
+        monotonic=lambda: clocks["monotonic"],
+        reference=lambda: clocks["reference"],
+    )
+
+    clocks["monotonic"] += 10
+    clocks["reference"] += 12
+    assert backend.poll() == 0
+
+    clocks["monotonic"] += 1
+    clocks["reference"] += 61
+    assert backend.poll() == pytest.approx(62)
+    assert backend.poll() == 0
+
+
+def test_no_boottime_never_falls_back_to_the_wall_clock(monkeypatch):
+    def unavailable():
+        raise ImportError("No module named 'jeepney'")
+
+    monkeypatch.delattr("time.CLOCK_BOOTTIME", raising=False)
+    monkeypatch.setitem(SuspendDetector.BACKENDS, "logind", unavailable)
+
+    assert isinstance(SuspendDetector("clock").backend, DisabledBackend)